@@ -1,186 +1,120 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
-import base64
-
-@st.cache_data(ttl=60)
-def load_data(url):
-    data = pd.read_csv(url)
-    data = clean_data(data)
-    return data
-
-def clean_data(data):
-    columns_to_clean = ["VALOR ORÇADO", "VALOR INSUMO", "VALOR MÃO DE OBRA"]
-    for column in columns_to_clean:
-        data[column] = pd.to_numeric(
-            data[column]
-            .str.replace("R$", "")
-            .str.replace(".", "")
-            .str.replace(",", ".")
-            .str.strip(),
-            errors="coerce",
-        )
-    data["DATA ORÇADO"] = pd.to_datetime(
-        data["DATA ORÇADO"], format="%d/%m/%Y", errors="coerce"
+import cartoes
+import desempenho
+import recursos
+from contratos import CONTRATOS, IDS
+from dados import carregar_os
+
+VALUE_COLUMNS = ["VALOR ORÇADO", "VALOR INSUMO", "VALOR MÃO DE OBRA"]
+JULY_2024 = (pd.Timestamp(2024, 7, 1), pd.Timestamp(2024, 7, 31))
+
+def summarize_budgets(data):
+    categories = data["STATUS*"].cat.categories.str.lower()
+    status_class = np.append(
+        np.select(
+            [categories == "finalizado", categories == "orçado"],
+            ["finalizado", "orçado"],
+            "outro",
+        ),
+        "outro",
+    )[data["STATUS*"].cat.codes]
+    status_class = pd.Series(status_class, index=data.index, name="CLASSE")
+    return (
+        data.groupby(
+            [data["CONTRATO"], data["DATA ORÇADO"], status_class],
+            dropna=False,
+            observed=True,
+        )[VALUE_COLUMNS]
+        .sum()
+        .reset_index()
     )
-    return data
-
-def filter_data(data, contract, date_filter, value_column):
-    condition = ((data["STATUS*"].str.lower() == "finalizado") | (data["STATUS*"].str.lower() == "orçado")) & (data["CONTRATO"] == contract)
-    filtered_data = data[condition]
-    if date_filter == "today":
-        today = datetime.now().date()
-        filtered_data = filtered_data[filtered_data["DATA ORÇADO"].dt.date == today]
-    elif date_filter == "july_2024":
-        july_2024_start = datetime(2024, 7, 1)
-        july_2024_end = datetime(2024, 7, 31)
-        filtered_data = filtered_data[
-            (filtered_data["DATA ORÇADO"] >= july_2024_start) &
-            (filtered_data["DATA ORÇADO"] <= july_2024_end)
-        ]
-    return filtered_data[value_column].sum()
-
-def calculate_previa_medicao_july(data, contract):
-    july_2024_start = datetime(2024, 7, 1)
-    july_2024_end = datetime(2024, 7, 31)
-    filtered_data = data[
-        (data["STATUS*"].str.lower() == "finalizado") &
-        (data["CONTRATO"] == contract) &
-        (data["DATA ORÇADO"] >= july_2024_start) &
-        (data["DATA ORÇADO"] <= july_2024_end)
-    ]
-    return filtered_data["VALOR ORÇADO"].sum()
-
-def calculate_totals(data, contract):
-    condition = ((data["STATUS*"].str.lower() == "finalizado") | (data["STATUS*"].str.lower() == "orçado")) & (data["CONTRATO"] == contract)
-    filtered_data = data[condition]
-    total_insumo = filtered_data["VALOR INSUMO"].sum()
-    total_mao_de_obra = filtered_data["VALOR MÃO DE OBRA"].sum()
-    total_orcado = filtered_data["VALOR ORÇADO"].sum()
-    return total_insumo, total_mao_de_obra, total_orcado
 
-def create_metric_box(label, value):
-    return f"""
-    <div class="metric-box">
-        <h4>{label}</h4>
-        <p>{value}</p>
-    </div>
-    """
+def calculate_metrics(summary, today):
+    budgets = summary[summary["CLASSE"].isin(["finalizado", "orçado"])]
+    in_july = budgets["DATA ORÇADO"].between(*JULY_2024)
+    periods = {
+        "today": budgets[budgets["DATA ORÇADO"] == pd.Timestamp(today)],
+        "july_2024": budgets[in_july],
+        "total": budgets,
+        "previa_july_2024": budgets[in_july & (budgets["CLASSE"] == "finalizado")],
+    }
+    metrics = pd.concat(
+        {
+            period: rows.groupby("CONTRATO", observed=True)[VALUE_COLUMNS].sum()
+            for period, rows in periods.items()
+        },
+        axis=1,
+    )
+    return metrics.reindex(IDS).fillna(0)
 
 def get_base64_image(image_path):
     try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
+        return recursos.imagem_base64(image_path)
     except Exception as e:
         st.error(f"Error loading image: {e}")
         return None
 
-def display_metrics(data):
-    today_metrics = {
-        "0100215/2023": {
-            "budget": filter_data(data, "0100215/2023", "today", "VALOR ORÇADO"),
-            "insumo": filter_data(data, "0100215/2023", "today", "VALOR INSUMO"),
-            "mao_de_obra": filter_data(data, "0100215/2023", "today", "VALOR MÃO DE OBRA")
-        },
-        "0200215/2023": {
-            "budget": filter_data(data, "0200215/2023", "today", "VALOR ORÇADO"),
-            "insumo": filter_data(data, "0200215/2023", "today", "VALOR INSUMO"),
-            "mao_de_obra": filter_data(data, "0200215/2023", "today", "VALOR MÃO DE OBRA")
-        }
-    }
+def display_metrics(metrics):
+    previa_medicao_july = metrics[("previa_july_2024", "VALOR ORÇADO")]
 
-    july_2024_metrics = {
-        "0100215/2023": {
-            "budget": filter_data(data, "0100215/2023", "july_2024", "VALOR ORÇADO"),
-            "insumo": filter_data(data, "0100215/2023", "july_2024", "VALOR INSUMO"),
-            "mao_de_obra": filter_data(data, "0100215/2023", "july_2024", "VALOR MÃO DE OBRA")
-        },
-        "0200215/2023": {
-            "budget": filter_data(data, "0200215/2023", "july_2024", "VALOR ORÇADO"),
-            "insumo": filter_data(data, "0200215/2023", "july_2024", "VALOR INSUMO"),
-            "mao_de_obra": filter_data(data, "0200215/2023", "july_2024", "VALOR MÃO DE OBRA")
-        }
-    }
+    total_insumo = metrics[("total", "VALOR INSUMO")].sum()
+    total_mao_de_obra = metrics[("total", "VALOR MÃO DE OBRA")].sum()
+    total_orcado = metrics[("total", "VALOR ORÇADO")].sum()
+    total_medicao = previa_medicao_july.sum()
 
-    previa_medicao_july = {
-        "0100215/2023": calculate_previa_medicao_july(data, "0100215/2023"),
-        "0200215/2023": calculate_previa_medicao_july(data, "0200215/2023")
+    periods = {"today": "Hoje", "july_2024": "Julho 2024"}
+    labels = {
+        "VALOR ORÇADO": "Valor Orçado",
+        "VALOR INSUMO": "Valor Insumo",
+        "VALOR MÃO DE OBRA": "Valor Mão de Obra",
     }
-
-    total_metrics = {
-        "0100215/2023": calculate_totals(data, "0100215/2023"),
-        "0200215/2023": calculate_totals(data, "0200215/2023")
-    }
-
-    total_insumo = total_metrics["0100215/2023"][0] + total_metrics["0200215/2023"][0]
-    total_mao_de_obra = total_metrics["0100215/2023"][1] + total_metrics["0200215/2023"][1]
-    total_orcado = total_metrics["0100215/2023"][2] + total_metrics["0200215/2023"][2]
-    total_medicao = previa_medicao_july["0100215/2023"] + previa_medicao_july["0200215/2023"]
-
-    st.markdown('<p class="subheader-lote">Lote 1 0100215/2023</p>', unsafe_allow_html=True)
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
-    with col1:
-        st.markdown(create_metric_box("Valor Orçado - Hoje",
-                    f"R$ {today_metrics['0100215/2023']['budget']:,.2f}"), unsafe_allow_html=True)
-    with col2:
-        st.markdown(create_metric_box("Valor Insumo - Hoje",
-                    f"R$ {today_metrics['0100215/2023']['insumo']:,.2f}"), unsafe_allow_html=True)
-    with col3:
-        st.markdown(create_metric_box("Valor Mão de Obra - Hoje", f"R$ {today_metrics['0100215/2023']['mao_de_obra']:,.2f}"), unsafe_allow_html=True)
-    with col4:
-        st.markdown(create_metric_box("Valor Orçado - Julho 2024", f"R$ {july_2024_metrics['0100215/2023']['budget']:,.2f}"), unsafe_allow_html=True)
-    with col5:
-        st.markdown(create_metric_box("Valor Insumo - Julho 2024", f"R$ {july_2024_metrics['0100215/2023']['insumo']:,.2f}"), unsafe_allow_html=True)
-    with col6:
-        st.markdown(create_metric_box("Valor Mão de Obra - Julho 2024", f"R$ {july_2024_metrics['0100215/2023']['mao_de_obra']:,.2f}"), unsafe_allow_html=True)
-
-    st.markdown('<p class="subheader-lote">Lote 2 0200215/2023</p>', unsafe_allow_html=True)
-    col8, col9, col10, col11, col12, col13 = st.columns(6)
-    with col8:
-        st.markdown(create_metric_box("Valor Orçado - Hoje",
-                    f"R$ {today_metrics['0200215/2023']['budget']:,.2f}"), unsafe_allow_html=True)
-    with col9:
-        st.markdown(create_metric_box("Valor Insumo - Hoje",
-                    f"R$ {today_metrics['0200215/2023']['insumo']:,.2f}"), unsafe_allow_html=True)
-    with col10:
-        st.markdown(create_metric_box("Valor Mão de Obra - Hoje", f"R$ {today_metrics['0200215/2023']['mao_de_obra']:,.2f}"), unsafe_allow_html=True)
-    with col11:
-        st.markdown(create_metric_box("Valor Orçado - Julho 2024", f"R$ {july_2024_metrics['0200215/2023']['budget']:,.2f}"), unsafe_allow_html=True)
-    with col12:
-        st.markdown(create_metric_box("Valor Insumo - Julho 2024", f"R$ {july_2024_metrics['0200215/2023']['insumo']:,.2f}"), unsafe_allow_html=True)
-    with col13:
-        st.markdown(create_metric_box("Valor Mão de Obra - Julho 2024", f"R$ {july_2024_metrics['0200215/2023']['mao_de_obra']:,.2f}"), unsafe_allow_html=True)
+    for contract in CONTRATOS:
+        st.markdown(f'<p class="subheader-lote">{contract.rotulo} {contract.id}</p>', unsafe_allow_html=True)
+        cartoes.exibir_cartoes(
+            [
+                (f"{label} - {period_label}", f"R$ {metrics.loc[contract.id, (period, column)]:,.2f}")
+                for period, period_label in periods.items()
+                for column, label in labels.items()
+            ],
+            "metric-box",
+            6,
+        )
 
     st.markdown('<p class="subheader-lote">Totais</p>', unsafe_allow_html=True)
-    col14, col15, col16, col17 = st.columns(4)
-    with col14:
-        st.markdown(create_metric_box("Total Valor Insumo", f"R$ {total_insumo:,.2f}"), unsafe_allow_html=True)
-    with col15:
-        st.markdown(create_metric_box("Total Valor Mão de Obra", f"R$ {total_mao_de_obra:,.2f}"), unsafe_allow_html=True)
-    with col16:
-        st.markdown(create_metric_box("Total Valor Orçado - Julho 2024",
-                    f"R$ {total_orcado:,.2f}"), unsafe_allow_html=True)
-    with col17:
-        st.markdown(create_metric_box("Total Medição - Julho 2024",
-                    f"R$ {total_medicao:,.2f}"), unsafe_allow_html=True)
+    cartoes.exibir_cartoes(
+        [
+            ("Total Valor Insumo", f"R$ {total_insumo:,.2f}"),
+            ("Total Valor Mão de Obra", f"R$ {total_mao_de_obra:,.2f}"),
+            ("Total Valor Orçado - Julho 2024", f"R$ {total_orcado:,.2f}"),
+            ("Total Medição - Julho 2024", f"R$ {total_medicao:,.2f}"),
+        ],
+        "metric-box",
+        4,
+    )
 
     st.markdown('<p class="subheader-lote">Previa de Medição - Julho 2024</p>', unsafe_allow_html=True)
-    col18, col19 = st.columns(2)
-    with col18:
-        st.markdown(create_metric_box("Lote 1 - Contrato 0100215/2023",
-                    f"R$ {previa_medicao_july['0100215/2023']:,.2f}"), unsafe_allow_html=True)
-    with col19:
-        st.markdown(create_metric_box("Lote 2 - Contrato 0200215/2023",
-                    f"R$ {previa_medicao_july['0200215/2023']:,.2f}"), unsafe_allow_html=True)
+    cartoes.exibir_cartoes(
+        [
+            (f"{contract.rotulo} - Contrato {contract.id}", f"R$ {previa_medicao_july[contract.id]:,.2f}")
+            for contract in CONTRATOS
+        ],
+        "metric-box",
+        len(CONTRATOS),
+    )
 
 def principal():
-    url = "https://docs.google.com/spreadsheets/d/1vp62n11C8Gnx9QMHL08QofGnNdlt08P54EJ7bkOHVaE/export?format=csv"
-    data = load_data(url)
+    snapshot = carregar_os()
+    summary = snapshot.derivar(summarize_budgets)
+    with desempenho.medir("calculate_metrics"):
+        metrics = calculate_metrics(summary, datetime.now().date())
 
-    with open("./css/valor.css") as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+    recursos.aplicar_css("./css/valor.css")
 
-    display_metrics(data)
+    with desempenho.medir("display_metrics"):
+        display_metrics(metrics)
 
 if __name__ == "__main__":
     principal()
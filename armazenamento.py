@@ -0,0 +1,77 @@
+import glob
+import logging
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+DIRETORIO = os.environ.get("GENPAC_SNAPSHOTS", "./snapshots")
+MAXIMO_VERSOES = int(os.environ.get("GENPAC_MAXIMO_VERSOES", "30"))
+# O pandas grava string[pyarrow] como large_string, e os metadados dele trariam de
+# volta string[python]; object e string[python] viram string e voltam como eram
+TEXTO = {pa.large_string(): pd.StringDtype("pyarrow")}
+
+logger = logging.getLogger(__name__)
+
+
+def listar_versoes(nome):
+    return sorted(glob.glob(os.path.join(DIRETORIO, nome, "*.arrow")))
+
+
+def salvar(nome, versao, carregado_em, tabela):
+    existentes = listar_versoes(nome)
+    if existentes and existentes[-1].endswith(f"_{versao}.arrow"):
+        return existentes[-1]
+
+    pasta = os.path.join(DIRETORIO, nome)
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(
+        pasta, f"{carregado_em.strftime('%Y%m%dT%H%M%S')}_{versao}.arrow"
+    )
+
+    tabela_arrow = pa.Table.from_pandas(tabela, preserve_index=False)
+    tabela_arrow = tabela_arrow.replace_schema_metadata(
+        {
+            **tabela_arrow.schema.metadata,
+            b"genpac.versao": versao.encode(),
+            b"genpac.carregado_em": carregado_em.isoformat().encode(),
+        }
+    )
+
+    # Grava em arquivo temporário para que leitores nunca vejam um snapshot pela
+    # metade; o nome é exclusivo da thread porque duas cargas podem gravar a mesma versão
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    # Sem compressão: o arquivo mapeado em memória é lido direto, sem um buffer
+    # descomprimido a cada carga; só o to_pandas ainda copia as colunas
+    with pa.OSFile(temporario, "wb") as arquivo:
+        with pa.ipc.new_file(arquivo, tabela_arrow.schema) as escritor:
+            escritor.write_table(tabela_arrow)
+    os.replace(temporario, caminho)
+
+    for antigo in listar_versoes(nome)[:-MAXIMO_VERSOES]:
+        os.remove(antigo)
+    return caminho
+
+
+def carregar(caminho):
+    with pa.memory_map(caminho) as mapa:
+        tabela_arrow = pa.ipc.open_file(mapa).read_all()
+    metadados = tabela_arrow.schema.metadata
+    return (
+        metadados[b"genpac.versao"].decode(),
+        datetime.fromisoformat(metadados[b"genpac.carregado_em"].decode()),
+        tabela_arrow.to_pandas(types_mapper=TEXTO.get),
+    )
+
+
+def carregar_ultimo(nome):
+    versoes = listar_versoes(nome)
+    if not versoes:
+        return None
+    try:
+        return carregar(versoes[-1])
+    except (OSError, pa.ArrowInvalid, KeyError) as e:
+        logger.warning("Snapshot local %s ilegível: %s", versoes[-1], e)
+        return None
@@ -0,0 +1,91 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+
+class Atualizador:
+    # Mantém o snapshot atual de cada planilha e o renova numa thread própria,
+    # fora do caminho das requisições. `carregar(nome)` serve a primeira carga
+    # (do disco, se houver), feita uma única vez pela thread ou pela requisição
+    # que chegar antes, e `baixar(nome, anterior)` busca a versão nova na
+    # origem, podendo reaproveitar o snapshot atual. As planilhas são baixadas
+    # ao mesmo tempo, e uma origem lenta não atrasa a troca das outras. Depois
+    # de cada ciclo, `preparar(nome, snapshot)` adianta o que as páginas vão
+    # pedir à versão atual, ainda nesta thread.
+
+    def __init__(self, nomes, carregar, baixar, intervalo, preparar=None):
+        self.nomes = list(nomes)
+        self.intervalo = intervalo
+        self._carregar = carregar
+        self._baixar = baixar
+        self._preparar = preparar
+        self._atuais = {}
+        # Uma trava por planilha: a primeira carga de uma não espera a das outras
+        self._travas = {nome: threading.Lock() for nome in self.nomes}
+        self._parar = threading.Event()
+        self._thread = threading.Thread(
+            target=self._executar, name="atualizador", daemon=True
+        )
+
+    def iniciar(self):
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+
+    def disponivel(self, nome):
+        return nome in self._atuais
+
+    def atual(self, nome):
+        snapshot = self._atuais.get(nome)
+        if snapshot is None:
+            # Só a primeira requisição de cada planilha espera pela carga
+            with self._travas[nome]:
+                snapshot = self._atuais.get(nome)
+                if snapshot is None:
+                    snapshot = self._carregar(nome)
+                    self._atuais[nome] = snapshot
+                    logger.info("Planilha %s carregada na versão %s", nome, snapshot.versao)
+        return snapshot
+
+    def _trocar(self, nome, novo):
+        with self._travas[nome]:
+            # Relido sob a trava: a mesma versão mantém o objeto atual e os
+            # derivados que as páginas já calcularam nele
+            anterior = self._atuais.get(nome)
+            if anterior is not None:
+                if novo.versao == anterior.versao:
+                    return anterior
+                # Os resultados que as páginas pediram à versão anterior já ficam
+                # prontos na nova antes de ela ser publicada
+                novo.aquecer(anterior)
+            # Uma única atribuição: quem lê vê o snapshot anterior ou o novo, inteiro
+            self._atuais[nome] = novo
+        logger.info("Planilha %s atualizada para a versão %s", nome, novo.versao)
+        return novo
+
+    def _atualizar(self, nome):
+        # Sem versão atual, a thread faz a primeira carga ou espera a de uma
+        # requisição; o download só é lido de novo se a origem tiver mudado
+        anterior = self.atual(nome)
+        return self._trocar(nome, self._baixar(nome, anterior))
+
+    def _executar(self):
+        with ThreadPoolExecutor(
+            max_workers=len(self.nomes), thread_name_prefix="baixar"
+        ) as executor:
+            while True:
+                baixando = {executor.submit(self._atualizar, nome): nome for nome in self.nomes}
+                for futuro in as_completed(baixando):
+                    nome = baixando[futuro]
+                    try:
+                        snapshot = futuro.result()
+                        if self._preparar is not None:
+                            self._preparar(nome, snapshot)
+                    except Exception:
+                        logger.exception("Falha ao atualizar a planilha %s", nome)
+                if self._parar.wait(self.intervalo):
+                    return
@@ -0,0 +1,63 @@
+import argparse
+import time
+
+import pandas as pd
+
+import fontes
+from cubo import contar, fatiar, montar_cubo, por_dia
+from dados import tipar_os
+
+
+def por_mascara(tabela, inicio, fim, disciplina):
+    dados_filtrados = tabela[
+        (tabela["DATA RECEBIDO"] >= inicio) & (tabela["DATA RECEBIDO"] <= fim)
+    ]
+    dados_filtrados = dados_filtrados[dados_filtrados["DISCIPLINAS"] == disciplina]
+    os_por_dia = dados_filtrados.groupby(dados_filtrados["DATA RECEBIDO"].dt.date).size()
+    return os_por_dia, len(dados_filtrados)
+
+
+def por_cubo(cubo, inicio, fim, disciplina):
+    fatia = fatiar(cubo, "recebido", inicio, fim, {"DISCIPLINAS": disciplina})
+    return por_dia(fatia), contar(fatia)
+
+
+def cronometrar(funcao, *args, repeticoes=5):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Custo de um filtro do Contrato Geral: máscara nas linhas x recorte do cubo"
+    )
+    parser.add_argument("fonte", nargs="?", help="CSV, Parquet ou URL; padrão: fonte configurada")
+    args = parser.parse_args()
+
+    fonte = fontes.de_uri(args.fonte) if args.fonte else fontes.configurada("os")
+    tabela, _ = tipar_os(fonte.ler(fonte.buscar()))
+    disciplina = tabela["DISCIPLINAS"].mode()[0]
+    inicio, fim = pd.Timestamp("2023-07-01"), pd.Timestamp("2025-12-31")
+
+    tempo_cubo, cubo = cronometrar(montar_cubo, tabela, repeticoes=1)
+    tempo_antigo, (antigo, total_antigo) = cronometrar(
+        por_mascara, tabela, inicio, fim, disciplina
+    )
+    tempo_novo, (novo, total_novo) = cronometrar(por_cubo, cubo, inicio, fim, disciplina)
+
+    linhas_cubo = sum(len(eventos) for eventos in cubo.eventos.values())
+    print(f"{len(tabela):,} linhas, cubo com {linhas_cubo:,} células")
+    print(f"  {'montar_cubo (uma vez por snapshot)':<36} {tempo_cubo * 1000:>9.1f} ms")
+    print(f"  {'máscara + groupby por filtro':<36} {tempo_antigo * 1000:>9.1f} ms")
+    print(
+        f"  {'recorte do cubo por filtro':<36} {tempo_novo * 1000:>9.1f} ms"
+        f"  resultado igual: {antigo.tolist() == novo.tolist() and total_antigo == total_novo}"
+    )
+
+
+if __name__ == "__main__":
+    main()
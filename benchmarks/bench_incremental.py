@@ -0,0 +1,85 @@
+import argparse
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+import incremental
+from benchmarks import gerador
+from cubo import atualizar_cubo, montar_cubo
+from dados import Snapshot, tipar_os
+
+
+def alterar(tabela, alteradas, novas, removidas, semente=0):
+    # O movimento de um dia: OS que andam de status, OS novas no fim e algumas apagadas
+    rng = np.random.default_rng(semente)
+    tabela = tabela.copy()
+    linhas = rng.choice(len(tabela), alteradas + removidas, replace=False)
+    tabela.loc[linhas[:alteradas], "STATUS*"] = "FINALIZADO"
+    tabela = tabela.drop(linhas[alteradas:])
+    extras = gerador.gerar_os(novas, semente=semente + 1)
+    extras["OS"] = (np.arange(novas) + len(tabela) + removidas + 1).astype(str)
+    return pd.concat([tabela, extras], ignore_index=True)
+
+
+def carga_completa(conteudo):
+    bruta = pd.read_csv(io.BytesIO(conteudo))
+    indice = incremental.indexar(conteudo, bruta)
+    tabela, rejeitados = tipar_os(bruta)
+    return Snapshot("", None, tabela, rejeitados, indice=indice)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Carga completa x incremental da planilha de OS após o movimento de um dia"
+    )
+    parser.add_argument("--linhas", type=int, default=100_000)
+    parser.add_argument("--alteradas", type=int, default=300)
+    parser.add_argument("--novas", type=int, default=200)
+    parser.add_argument("--removidas", type=int, default=20)
+    args = parser.parse_args()
+
+    base = gerador.gerar_os(args.linhas)
+    antes = base.to_csv(index=False).encode()
+    depois = alterar(base, args.alteradas, args.novas, args.removidas).to_csv(
+        index=False
+    ).encode()
+    anterior = carga_completa(antes)
+    cubo = montar_cubo(anterior.tabela)
+
+    inicio = time.perf_counter()
+    completa = carga_completa(depois)
+    tempo_completa = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    montar_cubo(completa.tabela)
+    tempo_cubo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    tabela, _, _, delta = incremental.aplicar(depois, anterior, tipar_os, "OS")
+    tempo_incremental = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    atualizar_cubo(cubo, tabela, delta.removidas, delta.adicionadas)
+    tempo_atualizacao = time.perf_counter() - inicio
+
+    print(
+        f"{len(tabela):,} linhas, {len(delta.adicionadas):,} entraram e "
+        f"{len(delta.removidas):,} saíram"
+    )
+    print(f"  {'leitura + limpeza completas':<30} {tempo_completa * 1000:>9.1f} ms")
+    print(f"  {'carga incremental':<30} {tempo_incremental * 1000:>9.1f} ms")
+    print(f"  {'montar_cubo':<30} {tempo_cubo * 1000:>9.1f} ms")
+    print(f"  {'atualizar_cubo':<30} {tempo_atualizacao * 1000:>9.1f} ms")
+    # O caminho inteiro de cada versão nova: planilha e cubo
+    print(
+        f"  {'completa + montar_cubo':<30} "
+        f"{(tempo_completa + tempo_cubo) * 1000:>9.1f} ms"
+    )
+    print(
+        f"  {'incremental + atualizar_cubo':<30} "
+        f"{(tempo_incremental + tempo_atualizacao) * 1000:>9.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import argparse
+
+import pandas as pd
+
+import esquema
+import fontes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Memória por coluna da planilha de OS antes e depois do esquema"
+    )
+    parser.add_argument("fonte", nargs="?", help="CSV, Parquet ou URL; padrão: fonte configurada")
+    args = parser.parse_args()
+
+    fonte = fontes.de_uri(args.fonte) if args.fonte else fontes.configurada("os")
+    bruta = fonte.ler(fonte.buscar())
+    antes = bruta.memory_usage(deep=True, index=False)
+    tipada, _ = esquema.aplicar(bruta.copy(), esquema.OS)
+    relatorio = esquema.relatorio_memoria(antes, tipada)
+    with pd.option_context("display.width", 120, "display.float_format", "{:.1f}".format):
+        print(relatorio)
+
+
+if __name__ == "__main__":
+    main()
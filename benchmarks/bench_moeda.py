@@ -0,0 +1,85 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from moeda import converter_colunas, converter_moeda
+
+
+def gerar_celulas(linhas, semente=0):
+    rng = np.random.default_rng(semente)
+    valores = rng.uniform(-5_000, 250_000, linhas)
+    texto = pd.Series(
+        [f"R$ {v:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".") for v in valores]
+    )
+    return texto.where(rng.random(linhas) >= 0.1)
+
+
+def convert_currency(value):
+    if isinstance(value, str):
+        return float(
+            value.replace("R$", "")
+            .replace(".", "")
+            .replace(",", ".")
+            .strip()
+        )
+    return value
+
+
+def por_linha(serie):
+    return serie.apply(convert_currency)
+
+
+def replace_encadeado(serie):
+    return pd.to_numeric(
+        serie.str.replace("R$", "")
+        .str.replace(".", "")
+        .str.replace(",", ".")
+        .str.strip(),
+        errors="coerce",
+    )
+
+
+def vetorizado(serie):
+    return converter_moeda(serie)[0]
+
+
+def cronometrar(funcao, *args, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os conversores de moeda")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    serie = gerar_celulas(args.linhas)
+    referencia = None
+    print(f"{args.linhas:,} células, uma coluna")
+    for nome, funcao in [
+        ("Series.apply(convert_currency)", por_linha),
+        ("4x str.replace + to_numeric", replace_encadeado),
+        ("moeda.converter_moeda", vetorizado),
+    ]:
+        tempo, resultado = cronometrar(funcao, serie)
+        if referencia is None:
+            referencia = resultado
+        iguais = np.allclose(resultado, referencia, equal_nan=True)
+        print(f"  {nome:<32} {tempo * 1000:>9.1f} ms  resultado igual: {iguais}")
+
+    tabela = pd.DataFrame({c: gerar_celulas(args.linhas, i) for i, c in enumerate("ABC")})
+    tempo_antigo, _ = cronometrar(lambda t: {c: replace_encadeado(t[c]) for c in t}, tabela)
+    tempo_novo, _ = cronometrar(lambda t: converter_colunas(t.copy(), list(t)), tabela)
+    print(f"{args.linhas:,} linhas, três colunas")
+    print(f"  {'4x str.replace por coluna':<32} {tempo_antigo * 1000:>9.1f} ms")
+    print(f"  {'moeda.converter_colunas':<32} {tempo_novo * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from contratos import CONTRATOS as REGISTRO
+from contratos import STATUS_ABERTO, STATUS_FINALIZADO
+
+# Vocabulário das planilhas reais, com pesos aproximados. Os contratos, status e
+# disciplinas vêm do registro; a planilha real também traz OS de um contrato fora dele
+CONTRATOS = [contrato.id for contrato in REGISTRO] + ["0300215/2023"]
+PESO_FORA_DO_REGISTRO = 0.03
+PESOS_CONTRATOS = [(1 - PESO_FORA_DO_REGISTRO) / len(REGISTRO)] * len(REGISTRO) + [
+    PESO_FORA_DO_REGISTRO
+]
+# As disciplinas dos grupos de cada contrato e uma que nenhum grupo conta
+DISCIPLINAS = list(
+    dict.fromkeys(
+        disciplina
+        for contrato in REGISTRO
+        for disciplinas in contrato.grupos.values()
+        for disciplina in disciplinas
+    )
+) + ["AR CONDICIONADO"]
+ORCAMENTISTAS = ["ANA", "BRUNO", "CARLA", "DIEGO", "ELISA", "FÁBIO"]
+RESPONSAVEIS = ["JOÃO", "MARIA", "PEDRO", "LUCIANA", "RAFAEL", "SANDRA", "TIAGO", "VERA"]
+INICIO = pd.Timestamp("2023-01-02")
+# Data fixa de "hoje" para que as planilhas, e os tempos medidos, sejam reproduzíveis
+HOJE = pd.Timestamp("2024-07-15")
+
+DIRETORIO = os.path.join(tempfile.gettempdir(), "genpac-bench")
+TAMANHOS = [10_000, 100_000, 1_000_000]
+
+
+def _pesos(n, rng):
+    pesos = rng.pareto(1.5, n) + 1
+    return pesos / pesos.sum()
+
+
+def _datas(datas, vazias):
+    texto = pd.Series(datas).dt.strftime("%d/%m/%Y")
+    return texto.mask(vazias | texto.isna())
+
+
+def _moeda(valores, vazias, rng):
+    # "R$ 1.234,56", com negativos, zeros contábeis e alguns valores inválidos
+    centavos = np.round(np.abs(valores) * 100).astype(np.int64)
+    reais = pd.Series(centavos // 100).map("{:,}".format).str.replace(",", ".")
+    texto = "R$ " + reais + "," + pd.Series(centavos % 100).astype(str).str.zfill(2)
+    texto = texto.mask(valores < 0, "-" + texto)
+    sorteio = rng.random(len(valores))
+    texto = texto.mask(sorteio < 0.01, "R$ -")
+    texto = texto.mask((sorteio >= 0.01) & (sorteio < 0.0115), "A DEFINIR")
+    return texto.mask(vazias)
+
+
+def gerar_os(linhas, semente=0, hoje=HOJE):
+    rng = np.random.default_rng(semente)
+    hoje = pd.Timestamp(hoje).normalize()
+    dias = (hoje - INICIO).days
+
+    status_todos = STATUS_ABERTO + STATUS_FINALIZADO + ["CANCELADO"]
+    status = rng.choice(status_todos, linhas, p=_pesos(len(status_todos), rng))
+    finalizada = np.isin(status, STATUS_FINALIZADO)
+    orcada = finalizada | ~np.isin(status, ["RECEBIDO", "LEVANTAMENTO", "EM ORÇAMENTO"])
+
+    recebido = INICIO + pd.to_timedelta(rng.integers(0, dias + 1, linhas), unit="D")
+    orcado = recebido + pd.to_timedelta(rng.integers(0, 15, linhas), unit="D")
+    finalizado = orcado + pd.to_timedelta(rng.integers(0, 45, linhas), unit="D")
+    orcado = orcado.where(orcado <= hoje, hoje)
+    finalizado = finalizado.where(finalizado <= hoje, hoje)
+
+    # Uma parte das OS anda hoje, para o Relatório Diário ter o que mostrar
+    movimento_hoje = rng.random(linhas) < 0.02
+    recebido = recebido.where(~(movimento_hoje & ~orcada), hoje)
+    orcado = orcado.where(~(movimento_hoje & orcada & ~finalizada), hoje)
+    finalizado = finalizado.where(~(movimento_hoje & finalizada), hoje)
+
+    valor_orcado = rng.lognormal(8, 1.2, linhas).round(2)
+    parcela_insumo = rng.uniform(0.2, 0.7, linhas)
+    valor_orcado[rng.random(linhas) < 0.002] *= -1
+
+    return pd.DataFrame(
+        {
+            "OS": pd.Series(np.arange(1, linhas + 1)).astype(str).str.zfill(6),
+            "CONTRATO": rng.choice(CONTRATOS, linhas, p=PESOS_CONTRATOS),
+            "STATUS*": status,
+            "DISCIPLINAS": rng.choice(DISCIPLINAS, linhas, p=_pesos(len(DISCIPLINAS), rng)),
+            "ORÇAMENTISTA": pd.Series(rng.choice(ORCAMENTISTAS, linhas)).mask(~orcada),
+            "RESPONSAVEL TÉCNICO": rng.choice(RESPONSAVEIS, linhas),
+            "DATA RECEBIDO": _datas(recebido, rng.random(linhas) < 0.005),
+            "DATA ORÇADO": _datas(orcado, ~orcada),
+            "DATA FINALIZADO": _datas(finalizado, ~finalizada),
+            "VALOR ORÇADO": _moeda(valor_orcado, ~orcada, rng),
+            "VALOR INSUMO": _moeda(valor_orcado * parcela_insumo, ~orcada, rng),
+            "VALOR MÃO DE OBRA": _moeda(valor_orcado * (1 - parcela_insumo), ~orcada, rng),
+            "OBSERVAÇÃO": pd.Series(
+                rng.choice(["URGENTE", "AGUARDANDO MATERIAL", "REVISAR ORÇAMENTO"], linhas)
+            ).mask(rng.random(linhas) < 0.9),
+        }
+    )
+
+
+def gerar_saldos(linhas, semente=1):
+    rng = np.random.default_rng(semente)
+    sem_valor = rng.random(linhas) < 0.01
+    valor = _moeda(rng.uniform(1_000, 90_000, linhas).round(2), sem_valor, rng)
+    # Linhas de rodapé com link, que a limpeza descarta
+    valor = valor.mask(rng.random(linhas) < 0.001, "https://drive.google.com/nf")
+    return pd.DataFrame(
+        {
+            "NOTA FISCAL": rng.integers(1_000, 999_999, linhas),
+            "LOTE": rng.choice([contrato.lote for contrato in REGISTRO], linhas),
+            "STATUS": rng.choice(["PAGO", "AGUARDANDO PAGAMENTO"], linhas, p=[0.8, 0.2]),
+            "MES": rng.integers(1, 13, linhas),
+            "ANO": rng.choice([2023, 2024, 2025], linhas),
+            "VALOR": valor,
+            # Saldos de cada contrato até o valor total dele
+            **{
+                contrato.coluna_saldo: _moeda(
+                    rng.uniform(1e5, contrato.teto, linhas).round(2), sem_valor, rng
+                )
+                for contrato in REGISTRO
+            },
+        }
+    )
+
+
+def garantir(linhas, diretorio=DIRETORIO):
+    # As planilhas de cada tamanho são geradas uma vez e reaproveitadas
+    os.makedirs(diretorio, exist_ok=True)
+    caminhos = {}
+    for nome, gerar in [("os", gerar_os), ("saldos", gerar_saldos)]:
+        caminho = os.path.join(diretorio, f"{nome}_{linhas}.csv")
+        if not os.path.exists(caminho):
+            gerar(linhas).to_csv(caminho, index=False)
+        caminhos[nome] = caminho
+    return caminhos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera planilhas sintéticas de OS e Saldos")
+    parser.add_argument("--linhas", type=int, nargs="+", default=TAMANHOS)
+    parser.add_argument("--diretorio", default=DIRETORIO)
+    args = parser.parse_args()
+
+    for linhas in args.linhas:
+        for nome, caminho in garantir(linhas, args.diretorio).items():
+            print(f"{nome:<7} {linhas:>9,} linhas  {caminho}")
+
+
+if __name__ == "__main__":
+    main()
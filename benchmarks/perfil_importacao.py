@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE = os.path.join(RAIZ, "benchmarks", "importacao_base.json")
+
+# O que contrato.py importava antes de abrir qualquer página, o que ele importa
+# até mostrar o menu (sem página escolhida) e o que cada página importa sozinha
+# agora que elas são carregadas sob demanda
+CENARIOS = {
+    "shell": (
+        "import streamlit as st; st.sidebar.radio = lambda *args, **kwargs: None; "
+        "import contrato"
+    ),
+    "todas_as_paginas": "import saldos, Valor_contrato, relatoriodiario, gerar_contrato",
+    "Contrato Geral": "import gerar_contrato",
+    "Orçamentos": "import Valor_contrato",
+    "Relatório Diário": "import relatoriodiario",
+    "Saldos Contratos": "import saldos",
+}
+
+
+def medir(codigo):
+    # -X importtime escreve no stderr "import time: próprio | cumulativo | pacote",
+    # com o nome recuado conforme a profundidade da importação
+    saida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    total = 0
+    pacotes = {}
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        ms = int(cumulativo) / 1000
+        if not nome.startswith("  "):
+            total += ms
+        # Cada pacote conta pela primeira importação, que inclui os submódulos
+        raiz = nome.strip().split(".")[0]
+        pacotes[raiz] = max(pacotes.get(raiz, 0), ms)
+    return total, pacotes
+
+
+def perfil(codigo, repeticoes, maiores):
+    total, pacotes = min((medir(codigo) for _ in range(repeticoes)), key=lambda m: m[0])
+    ordenados = sorted(pacotes.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "total_ms": round(total, 1),
+        "maiores_ms": {nome: round(ms, 1) for nome, ms in ordenados[:maiores]},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tempo de importação de cada página (python -X importtime)"
+    )
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--maiores", type=int, default=8)
+    parser.add_argument(
+        "--gravar", action="store_true", help=f"grava o resultado como base em {BASE}"
+    )
+    args = parser.parse_args()
+
+    # A primeira execução compila os .pyc e não entra na medição
+    medir(CENARIOS["todas_as_paginas"])
+    resultado = {
+        "python": platform.python_version(),
+        "cenarios": {
+            nome: perfil(codigo, args.repeticoes, args.maiores)
+            for nome, codigo in CENARIOS.items()
+        },
+    }
+
+    base = None
+    if os.path.exists(BASE):
+        with open(BASE, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+
+    for nome, medicao in resultado["cenarios"].items():
+        linha = f"{nome:<20} {medicao['total_ms']:>8.1f} ms"
+        if base and nome in base["cenarios"]:
+            linha += f"  (base {base['cenarios'][nome]['total_ms']:.1f} ms)"
+        print(linha)
+        for pacote, ms in medicao["maiores_ms"].items():
+            print(f"    {pacote:<24} {ms:>8.1f} ms")
+
+    if args.gravar:
+        with open(BASE, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+            arquivo.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import functools
+import os
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import fontes
+
+
+def gravar(diretorio, formato):
+    os.makedirs(diretorio, exist_ok=True)
+    for nome in fontes.PADROES:
+        fonte = fontes.configurada(nome)
+        conteudo = fonte.buscar()
+        caminho = os.path.join(diretorio, f"{nome}.{formato}")
+        if formato == "parquet":
+            fonte.ler(conteudo).to_parquet(caminho, index=False)
+        else:
+            with open(caminho, "wb") as arquivo:
+                arquivo.write(conteudo)
+        print(f"{fonte!r} -> {caminho}")
+        print(f"  GENPAC_FONTE_{nome.upper()}={os.path.abspath(caminho)}")
+
+
+def servir(diretorio, porta):
+    manipulador = functools.partial(SimpleHTTPRequestHandler, directory=diretorio)
+    servidor = ThreadingHTTPServer(("127.0.0.1", porta), manipulador)
+    for arquivo in sorted(os.listdir(diretorio)):
+        nome = os.path.splitext(arquivo)[0]
+        if nome in fontes.PADROES:
+            print(f"GENPAC_FONTE_{nome.upper()}=http://127.0.0.1:{porta}/{arquivo}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Grava as planilhas da fonte configurada e as serve por HTTP local"
+    )
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    parser_gravar = comandos.add_parser("gravar")
+    parser_gravar.add_argument("diretorio")
+    parser_gravar.add_argument("--formato", choices=["csv", "parquet"], default="csv")
+    parser_servir = comandos.add_parser("servir")
+    parser_servir.add_argument("diretorio")
+    parser_servir.add_argument("--porta", type=int, default=8000)
+    args = parser.parse_args()
+
+    if args.comando == "gravar":
+        gravar(args.diretorio, args.formato)
+    else:
+        servir(args.diretorio, args.porta)
+
+
+if __name__ == "__main__":
+    main()
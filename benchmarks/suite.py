@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import fontes
+from benchmarks import gerador
+from contratos import IDS, resultados
+from cubo import contar, fatiar, montar_cubo, por_dia, por_mes
+from dados import tipar_os, tipar_saldos
+from indicadores import (
+    calcular_metricas,
+    contar_disciplinas_finalizadas,
+    contar_ocorrencias,
+    montar_metricas,
+)
+from saldos import summarize_balances
+from Valor_contrato import calculate_metrics, summarize_budgets
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE = os.path.join(RAIZ, "benchmarks", "suite_base.json")
+RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+
+
+def cronometrar(funcao, repeticoes, preparar=None):
+    tempos = []
+    for _ in range(repeticoes):
+        args = preparar() if preparar else ()
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return round(min(tempos) * 1000, 2), resultado
+
+
+def recortes_contrato_geral(cubo):
+    # Os recortes que a página Contrato Geral faz com os filtros no padrão
+    contar(fatiar(cubo, "recebido", "2024-06-01", "2024-06-30"))
+    por_mes(fatiar(cubo, "recebido", "2023-01-01", "2024-12-31"))
+    por_dia(fatiar(cubo, "recebido", "2023-07-01", "2025-12-31", {"DISCIPLINAS": "CIVIL"}))
+    por_dia(fatiar(cubo, "recebido", "2023-07-01", "2025-12-31", {"STATUS*": "EXECUÇÃO"}))
+    por_dia(fatiar(cubo, "finalizado", "2024-06-01", "2024-06-30"))
+    for ano in (2023, 2024):
+        por_dia(fatiar(cubo, "finalizado", f"{ano}-01-01", f"{ano}-12-31")).mean()
+    por_mes(fatiar(cubo, "orcado", "2023-01-01", "2025-12-31"))
+    por_dia(fatiar(cubo, "orcado", "2023-01-01", "2024-12-31", {"ORÇAMENTISTA": "ANA"}))
+
+
+def medir(linhas, repeticoes):
+    caminhos = gerador.garantir(linhas)
+    hoje = gerador.HOJE.date()
+    etapas = {}
+
+    fonte = fontes.FonteArquivo(caminhos["os"])
+    conteudo = fonte.buscar()
+    etapas["os.ler"], bruta = cronometrar(lambda: fonte.ler(conteudo), repeticoes)
+    etapas["os.tipar"], (tabela, _) = cronometrar(
+        tipar_os, repeticoes, preparar=lambda: (bruta.copy(),)
+    )
+
+    etapas["orcamentos.summarize_budgets"], resumo = cronometrar(
+        lambda: summarize_budgets(tabela), repeticoes
+    )
+    etapas["orcamentos.calculate_metrics"], _ = cronometrar(
+        lambda: calculate_metrics(resumo, hoje), repeticoes
+    )
+
+    etapas["relatorio.montar_metricas"], metricas = cronometrar(
+        lambda: montar_metricas(tabela, hoje), repeticoes
+    )
+    etapas["relatorio.calcular_metricas"], _ = cronometrar(
+        lambda: [calcular_metricas(metricas, contrato) for contrato in IDS], repeticoes
+    )
+    etapas["relatorio.contar_ocorrencias"], ocorrencias = cronometrar(
+        lambda: contar_ocorrencias(tabela), repeticoes
+    )
+    etapas["relatorio.resultados"], _ = cronometrar(
+        lambda: resultados(ocorrencias), repeticoes
+    )
+    etapas["relatorio.contar_disciplinas_finalizadas"], _ = cronometrar(
+        lambda: contar_disciplinas_finalizadas(tabela, hoje), repeticoes
+    )
+
+    etapas["contrato_geral.montar_cubo"], cubo = cronometrar(
+        lambda: montar_cubo(tabela), repeticoes
+    )
+    etapas["contrato_geral.recortes"], _ = cronometrar(
+        lambda: recortes_contrato_geral(cubo), repeticoes
+    )
+
+    fonte = fontes.FonteArquivo(caminhos["saldos"])
+    conteudo = fonte.buscar()
+    etapas["saldos.ler"], bruta = cronometrar(lambda: fonte.ler(conteudo), repeticoes)
+    etapas["saldos.tipar"], (saldos, _) = cronometrar(
+        tipar_saldos, repeticoes, preparar=lambda: (bruta.copy(),)
+    )
+    etapas["saldos.summarize_balances"], _ = cronometrar(
+        lambda: summarize_balances(saldos), repeticoes
+    )
+    return etapas
+
+
+def comparar(resultado, base, tolerancia, minimo_ms):
+    regressoes = []
+    for linhas, etapas in resultado["linhas"].items():
+        print(f"{int(linhas):,} linhas")
+        referencia = base["linhas"].get(linhas, {}) if base else {}
+        for etapa, ms in etapas.items():
+            linha = f"  {etapa:<42} {ms:>10.2f} ms"
+            if etapa in referencia:
+                razao = ms / referencia[etapa] if referencia[etapa] else float("inf")
+                linha += f"  base {referencia[etapa]:>10.2f} ms  x{razao:.2f}"
+                if razao > 1 + tolerancia and ms - referencia[etapa] > minimo_ms:
+                    linha += "  REGRESSÃO"
+                    regressoes.append((linhas, etapa))
+            print(linha)
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede carga, limpeza e cálculos de cada página em planilhas sintéticas"
+    )
+    parser.add_argument("--linhas", type=int, nargs="+", default=gerador.TAMANHOS)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", help="arquivo JSON de resultados")
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    parser.add_argument("--minimo-ms", type=float, default=5.0)
+    parser.add_argument(
+        "--gravar-base", action="store_true", help=f"grava o resultado como base em {BASE}"
+    )
+    args = parser.parse_args()
+
+    resultado = {
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "linhas": {str(linhas): medir(linhas, args.repeticoes) for linhas in args.linhas},
+    }
+
+    saida = args.saida or os.path.join(
+        RESULTADOS, f"suite_{datetime.now():%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+
+    base = None
+    if os.path.exists(BASE) and not args.gravar_base:
+        with open(BASE, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+    regressoes = comparar(resultado, base, args.tolerancia, args.minimo_ms)
+    print(f"Resultados em {saida}")
+
+    if args.gravar_base:
+        with open(BASE, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+            arquivo.write("\n")
+    if regressoes:
+        sys.exit(f"{len(regressoes)} etapa(s) mais lentas que a base")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import html
+
+import pandas as pd
+import streamlit as st
+
+# Cartões com rótulo e valor em spans; as demais classes usam título em <h4> e valor em <p>
+EM_LINHA = {"stMetric-container": ("stMetric-label", "stMetric-value")}
+
+
+def _escapar(valores):
+    return [html.escape(str(valor)) for valor in valores]
+
+
+def _cartao(classe, titulo, valor):
+    if classe in EM_LINHA:
+        rotulo, destaque = EM_LINHA[classe]
+        return (
+            f'<div class="{classe}"><span class="{rotulo}">{titulo}</span>'
+            f'<span class="{destaque}">{valor}</span></div>'
+        )
+    # Um valor com várias linhas (lista) vira um parágrafo por linha
+    linhas = valor if isinstance(valor, list) else [valor]
+    paragrafos = "".join(f"<p>{linha}</p>" for linha in linhas)
+    return f'<div class="{classe}"><h4>{titulo}</h4>{paragrafos}</div>'
+
+
+def montar_cartoes(cartoes, classe="metric-card", colunas=4):
+    # `cartoes` é um DataFrame com as colunas "titulo" e "valor", ou uma lista de pares
+    cartoes = pd.DataFrame(cartoes, columns=["titulo", "valor"])
+    valores = [
+        _escapar(valor) if isinstance(valor, list) else html.escape(str(valor))
+        for valor in cartoes["valor"]
+    ]
+    corpo = "".join(
+        _cartao(classe, titulo, valor)
+        for titulo, valor in zip(_escapar(cartoes["titulo"]), valores)
+    )
+    return f'<div class="cartoes" style="--colunas: {colunas}">{corpo}</div>'
+
+
+def exibir_cartoes(cartoes, classe="metric-card", colunas=4):
+    # A grade inteira vai ao navegador como um único elemento
+    st.markdown(montar_cartoes(cartoes, classe, colunas), unsafe_allow_html=True)
+
+
+def montar_lista(tabela, rotulo, valor):
+    return "".join(
+        f"<div><span class='custom-disciplina'>{nome}:</span> "
+        f"<span class='custom-quantidade'>{quantidade}</span></div>"
+        for nome, quantidade in zip(_escapar(tabela[rotulo]), _escapar(tabela[valor]))
+    )
+
+
+def exibir_lista(tabela, rotulo, valor):
+    if len(tabela):
+        st.markdown(montar_lista(tabela, rotulo, valor), unsafe_allow_html=True)
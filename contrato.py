@@ -1,27 +1,32 @@
+import importlib
+import sys
 import streamlit as st
 from datetime import datetime
 from pytz import timezone
 
+import desempenho
+import recursos
+
 # Configurar o layout
 st.set_page_config(layout="wide", page_title="Relatório Banrisul")
 
 # Carregar o arquivo CSS
-with open("./css/app.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-# Funções das páginas
-from saldos import main as mostrar_saldos
-from Valor_contrato import principal as mostrar_valor
-from relatoriodiario import relatoriodiario as mostrar_relatorio
-from gerar_contrato import gerar_contrato as gerar_contrato
+recursos.aplicar_css("./css/app.css")
 
+# Funções das páginas, como "módulo:função". Só o módulo da página escolhida
+# é importado, junto com as dependências dele
 PAGES = {
-    "Contrato Geral": gerar_contrato,
-    "Orçamentos": mostrar_valor,
-    "Relatório Diário": mostrar_relatorio,
-    "Saldos Contratos": mostrar_saldos,
+    "Contrato Geral": "gerar_contrato:gerar_contrato",
+    "Orçamentos": "Valor_contrato:principal",
+    "Relatório Diário": "relatoriodiario:relatoriodiario",
+    "Saldos Contratos": "saldos:main",
 }
 
+
+def carregar_pagina(caminho):
+    modulo, funcao = caminho.split(":")
+    return getattr(importlib.import_module(modulo), funcao)
+
 # Título do Relatório
 st.markdown("<h1 style='text-align: center; font-size: 48px;'>Relatório Banrisul</h1>", unsafe_allow_html=True)
 
@@ -42,15 +47,36 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-st.sidebar.image("./image/logo.png", use_column_width=True)
+st.sidebar.image(recursos.imagem("./image/logo.png"), use_column_width=True)
 st.sidebar.markdown("# Banrisul")
 
 # Adicionar botões de navegação na barra lateral
 selected_page = st.sidebar.radio("Selecione a página", list(PAGES.keys()))
 
+with st.sidebar.expander("Diagnóstico"):
+    cache = recursos.estatisticas()
+    st.caption(
+        f"Cache de arquivos estáticos: {cache['acertos']} acertos, "
+        f"{cache['leituras']} leituras, {cache['arquivos']} arquivos"
+    )
+    # As planilhas só são buscadas depois que uma página importa fontes (e o
+    # pandas); antes disso não há o que mostrar e o módulo não é carregado aqui
+    fontes = sys.modules.get("fontes")
+    for fonte, busca in (fontes.metricas() if fontes else {}).items():
+        st.caption(
+            f"Planilha {fonte}: {busca['buscas']} buscas, {busca['inalteradas']} sem mudança, "
+            f"{busca['falhas']} falhas, "
+            f"{busca['tentativas']} tentativas, última em {busca['ultima_ms']:.0f} ms"
+        )
+    mostrar_desempenho = st.checkbox("Mostrar desempenho da página")
+
 if selected_page:
-    page = PAGES[selected_page]
-    page()
+    with desempenho.medir(f"página {selected_page}") as medicao:
+        with desempenho.medir("importar"):
+            page = carregar_pagina(PAGES[selected_page])
+        page()
+    if mostrar_desempenho:
+        desempenho.painel(medicao)
 else:
     st.markdown('<div class="stAlert">Selecione uma página no menu acima.</div>', unsafe_allow_html=True)
 
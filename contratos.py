@@ -0,0 +1,99 @@
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+STATUS_ABERTO = [
+    "RECEBIDO",
+    "ORÇADO",
+    "COMPRAS",
+    "EXECUÇÃO",
+    "VERIFICAR",
+    "PREVENTIVA",
+    "LEVANTAMENTO",
+    "EM ORÇAMENTO",
+    "EM ESPERA",
+    "PROGRAMADO",
+]
+STATUS_FINALIZADO = ["FINALIZADO", "NOTA FISCAL", "EXECUTADO", "MEDIÇÃO"]
+DISCIPLINAS_CIVIL = [
+    "ALVENARIA",
+    "HIDRÁULICA",
+    "CIVIL",
+    "COBERTURA",
+    "COMUNICAÇÃO VISUAL",
+    "DRYWALL",
+    "INSUMOS E EQUIPAMENTOS",
+    "IMPERMEABILIZAÇÃO",
+    "MARCENARIA",
+    "PINTURA",
+    "SERRALHERIA",
+    "VIDRAÇARIA",
+    "PERSIANA",
+    "EXTINTOR",
+]
+# Grupo de disciplinas -> disciplinas, na ordem em que os resultados aparecem
+GRUPOS = {"CIVIL": DISCIPLINAS_CIVIL, "ELÉTRICA": ["ELÉTRICA"]}
+
+
+@dataclass(frozen=True)
+class Contrato:
+    # Número do contrato, como na coluna CONTRATO da planilha de OS
+    id: str
+    # Nome do lote nas páginas ("Lote 01") e no título curto dos cartões ("LT1")
+    rotulo: str
+    sigla: str
+    # Valor na coluna LOTE e coluna de saldo da planilha de saldos
+    lote: str
+    coluna_saldo: str
+    # Valor total do contrato, em reais
+    teto: float
+    grupos: dict = field(default_factory=lambda: GRUPOS)
+
+
+# Um contrato novo entra aqui; as páginas calculam e mostram todos os do registro
+CONTRATOS = [
+    Contrato("0100215/2023", "Lote 01", "LT1", "LOTE 01", "SALDO L1", 4_500_000.0),
+    Contrato("0200215/2023", "Lote 02", "LT2", "LOTE 02", "SALDO L2", 2_900_000.0),
+]
+IDS = [contrato.id for contrato in CONTRATOS]
+
+
+def rotulos():
+    # "Lote 01 e Lote 02", para os títulos das seções
+    return " e ".join(contrato.rotulo for contrato in CONTRATOS)
+
+
+def _classes():
+    classes = dict.fromkeys(STATUS_ABERTO, "abertas")
+    classes.update(dict.fromkeys(STATUS_FINALIZADO, "finalizadas"))
+    return classes
+
+
+def resultados(ocorrencias):
+    # Contagens por CONTRATO, DISCIPLINAS e STATUS* (coluna QUANTIDADE) -> abertas,
+    # finalizadas e percentual por (contrato, grupo), numa única passada agrupada
+    grupos = {}
+    for contrato in CONTRATOS:
+        for grupo, disciplinas in contrato.grupos.items():
+            grupos.update({(contrato.id, disciplina): grupo for disciplina in disciplinas})
+    chaves = pd.MultiIndex.from_arrays(
+        [ocorrencias["CONTRATO"].astype(object), ocorrencias["DISCIPLINAS"].astype(object)]
+    )
+    contagens = ocorrencias.groupby(
+        [
+            ocorrencias["CONTRATO"].astype(object),
+            pd.Series(chaves.map(grupos.get), index=ocorrencias.index, name="GRUPO"),
+            ocorrencias["STATUS*"].astype(object).map(_classes()).rename("CLASSE"),
+        ]
+    )["QUANTIDADE"].sum()
+    tabela = contagens.unstack("CLASSE").reindex(
+        index=pd.MultiIndex.from_tuples(
+            [(contrato.id, grupo) for contrato in CONTRATOS for grupo in contrato.grupos],
+            names=["CONTRATO", "GRUPO"],
+        ),
+        columns=["abertas", "finalizadas"],
+    )
+    tabela = tabela.fillna(0).astype(int)
+    total = tabela["abertas"] + tabela["finalizadas"]
+    tabela["percentual"] = (tabela["finalizadas"] / total * 100).where(total > 0, 0)
+    return tabela
@@ -0,0 +1,185 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Eventos do ciclo de uma OS e a coluna de data que marca cada um
+EVENTOS = {
+    "recebido": "DATA RECEBIDO",
+    "orcado": "DATA ORÇADO",
+    "finalizado": "DATA FINALIZADO",
+}
+DIMENSOES = ["CONTRATO", "DISCIPLINAS", "STATUS*", "ORÇAMENTISTA"]
+
+
+@dataclass(frozen=True)
+class Cubo:
+    # evento -> contagens por dia e dimensões, indexadas pelo DIA em ordem
+    eventos: dict
+    # contagens por dimensões, sem olhar datas
+    totais: pd.DataFrame
+    # valores de cada dimensão na ordem em que aparecem na planilha
+    opcoes: dict
+
+
+def montar_cubo(tabela):
+    dimensoes = [coluna for coluna in DIMENSOES if coluna in tabela.columns]
+
+    eventos = {}
+    for evento, coluna in EVENTOS.items():
+        contagem = tabela.groupby(
+            [tabela[coluna].rename("DIA"), *dimensoes], observed=True, dropna=False
+        ).size()
+        contagem = contagem[contagem.index.get_level_values("DIA").notna()]
+        eventos[evento] = contagem.reset_index(dimensoes, name="QUANTIDADE").sort_index()
+
+    totais = (
+        tabela.groupby(dimensoes, observed=True, dropna=False)
+        .size()
+        .reset_index(name="QUANTIDADE")
+    )
+    opcoes = {coluna: tabela[coluna].unique().tolist() for coluna in dimensoes}
+    return Cubo(eventos=eventos, totais=totais, opcoes=opcoes)
+
+
+def _tipar(parte, tipos):
+    # Só recodifica as colunas cujas categorias mudaram na versão nova
+    mudaram = {coluna: tipo for coluna, tipo in tipos.items() if parte[coluna].dtype != tipo}
+    return parte.astype(mudaram) if mudaram else parte
+
+
+DIA = pd.Timedelta(days=1).value
+
+
+def _niveis(parte, dimensoes, dias):
+    # Chaves do cubo como inteiros, na ordem do groupby: dias e categorias pelo
+    # código, com os nulos por último. None se alguma não der para codificar
+    niveis = []
+    if dias:
+        ns = parte.index.asi8
+        if (ns % DIA).any():
+            return None
+        niveis.append(ns // DIA)
+    for coluna in dimensoes:
+        serie = parte[coluna]
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            return None
+        codigos = serie.cat.codes.to_numpy(np.int64)
+        niveis.append(np.where(codigos < 0, len(serie.cat.categories), codigos))
+    return niveis
+
+
+def _chaves(antes, delta, dimensoes, dias):
+    # As chaves de cada linha viram um inteiro só, em base mista, que mantém a
+    # ordem do groupby. None se não couberem em 63 bits
+    niveis = [_niveis(parte, dimensoes, dias) for parte in (antes, delta)]
+    if any(nivel is None for nivel in niveis):
+        return None
+    chaves = [np.zeros(len(antes), np.int64), np.zeros(len(delta), np.int64)]
+    capacidade = 1
+    for nivel_antes, nivel_delta in zip(*niveis):
+        todos = np.concatenate([nivel_antes, nivel_delta])
+        if not len(todos):
+            continue
+        menor = todos.min()
+        base = int(todos.max() - menor) + 1
+        capacidade *= base
+        if capacidade >= 2**62:
+            return None
+        chaves = [
+            chave * base + (nivel - menor)
+            for chave, nivel in zip(chaves, (nivel_antes, nivel_delta))
+        ]
+    return chaves
+
+
+def _somar(antes, delta, dimensoes, dias):
+    # Soma o delta às contagens do cubo anterior pela posição de cada chave:
+    # as existentes mudam no lugar, as novas entram na ordem e as que zeram saem
+    chaves = _chaves(antes, delta, dimensoes, dias)
+    if chaves is None:
+        juntas = pd.concat([antes, delta])
+        grupos = [juntas.index, *dimensoes] if dias else dimensoes
+        soma = juntas.groupby(grupos, observed=True, dropna=False)["QUANTIDADE"].sum()
+        return soma[soma != 0].reset_index(dimensoes)
+    chave_antes, chave_delta = chaves
+    # Categorias mudadas deixam o cubo anterior fora da ordem dos códigos novos
+    if (np.diff(chave_antes) < 0).any():
+        ordem = np.argsort(chave_antes, kind="stable")
+        antes, chave_antes = antes.iloc[ordem], chave_antes[ordem]
+    posicoes = np.searchsorted(chave_antes, chave_delta)
+    dentro = posicoes < len(chave_antes)
+    achadas = np.zeros(len(delta), dtype=bool)
+    achadas[dentro] = chave_antes[posicoes[dentro]] == chave_delta[dentro]
+    quantidade = antes["QUANTIDADE"].to_numpy(copy=True)
+    quantidade[posicoes[achadas]] += delta["QUANTIDADE"].to_numpy()[achadas]
+    soma = antes.assign(QUANTIDADE=quantidade)
+    if not achadas.all():
+        novas = np.flatnonzero(~achadas)
+        novas = novas[np.argsort(chave_delta[novas], kind="stable")]
+        ordem = np.insert(np.arange(len(soma)), posicoes[novas], len(soma) + np.arange(len(novas)))
+        soma = pd.concat([soma, delta.iloc[novas]]).iloc[ordem]
+    soma = soma[soma["QUANTIDADE"] != 0]
+    return soma if dias else soma.reset_index(drop=True)
+
+
+def atualizar_cubo(cubo, tabela, removidas, adicionadas):
+    # Aplica ao cubo da versão anterior só as linhas que mudaram; o resultado
+    # é o mesmo de montar_cubo(tabela). Só as linhas do delta são agrupadas
+    dimensoes = [coluna for coluna in DIMENSOES if coluna in tabela.columns]
+    # Todas as partes passam às categorias da tabela nova. Uma categoria que
+    # sumiu vira nulo, mas as contagens dela se anulam na soma
+    tipos = {coluna: tabela[coluna].dtype for coluna in dimensoes}
+    colunas = [*EVENTOS.values(), *dimensoes]
+    linhas = _tipar(
+        pd.concat(
+            [adicionadas[colunas].assign(PESO=1), removidas[colunas].assign(PESO=-1)],
+            ignore_index=True,
+        ),
+        tipos,
+    )
+
+    def delta(chaves):
+        soma = linhas.groupby(chaves, observed=True, dropna=False)["PESO"].sum()
+        return soma[soma != 0].rename("QUANTIDADE")
+
+    eventos = {}
+    for evento, coluna in EVENTOS.items():
+        mudancas = delta([linhas[coluna].rename("DIA"), *dimensoes])
+        mudancas = mudancas[mudancas.index.get_level_values("DIA").notna()]
+        eventos[evento] = _somar(
+            _tipar(cubo.eventos[evento], tipos),
+            mudancas.reset_index(dimensoes),
+            dimensoes,
+            dias=True,
+        )
+
+    totais = _somar(
+        _tipar(cubo.totais, tipos), delta(dimensoes).reset_index(), dimensoes, dias=False
+    )
+    opcoes = {coluna: tabela[coluna].unique().tolist() for coluna in dimensoes}
+    return Cubo(eventos=eventos, totais=totais, opcoes=opcoes)
+
+
+def fatiar(cubo, evento, inicio=None, fim=None, filtros=None):
+    # O índice ordenado por dia permite recortar o período por busca binária
+    fatia = cubo.eventos[evento]
+    fatia = fatia.loc[
+        None if inicio is None else pd.Timestamp(inicio):
+        None if fim is None else pd.Timestamp(fim)
+    ]
+    for coluna, valor in (filtros or {}).items():
+        fatia = fatia[fatia[coluna] == valor]
+    return fatia
+
+
+def por_dia(fatia):
+    return fatia.groupby(level="DIA")["QUANTIDADE"].sum()
+
+
+def por_mes(fatia):
+    return fatia.groupby(fatia.index.to_period("M"))["QUANTIDADE"].sum()
+
+
+def contar(fatia):
+    return int(fatia["QUANTIDADE"].sum())
@@ -0,0 +1,248 @@
+import importlib
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from pytz import timezone
+
+import armazenamento
+import desempenho
+import esquema
+import fontes
+import incremental
+from atualizador import Atualizador
+from cubo import atualizar_cubo, montar_cubo
+
+# As páginas compartilham o mesmo DataFrame: nenhuma delas pode alterá-lo
+pd.set_option("mode.copy_on_write", True)
+
+INTERVALO_ATUALIZACAO = int(os.environ.get("GENPAC_INTERVALO_ATUALIZACAO", "60"))
+
+# Planilhas com carga incremental e a coluna que identifica cada linha
+CHAVES = {"os": "OS"}
+
+# Derivados que sabem se atualizar com as linhas que mudaram entre duas versões
+ATUALIZACOES = {montar_cubo: atualizar_cubo}
+
+# Trabalhos que o atualizador roda sobre a versão atual de cada planilha, como
+# "módulo:função"; o módulo só é importado quando o trabalho roda pela primeira vez
+PREPARAR = {"os": ["relatorio_pdf:preparar"]}
+
+logger = logging.getLogger(__name__)
+
+# Marca de derivado ainda não calculado (None pode ser um resultado)
+_AUSENTE = object()
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    versao: str
+    carregado_em: datetime
+    tabela: pd.DataFrame
+    rejeitados: pd.DataFrame = None
+    indice: incremental.Indice = None
+    delta: incremental.Delta = None
+    _derivados: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _pedidos: set = field(default_factory=set, init=False, repr=False, compare=False)
+    # Uma trava por derivado, para que um cálculo demorado (o PDF do dia, por
+    # exemplo) não segure os outros; `_trava` só protege o dicionário de travas
+    _travas: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _trava: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def derivar(self, funcao, *args):
+        # Resultados derivados da tabela são calculados uma vez por versão dos dados.
+        # Um resultado pronto volta direto, sem esperar trava nenhuma
+        chave = (funcao, args)
+        self._pedidos.add(chave)
+        resultado = self._derivados.get(chave, _AUSENTE)
+        if resultado is not _AUSENTE:
+            return resultado
+        return self._calcular(chave)
+
+    def _trava_de(self, chave):
+        with self._trava:
+            return self._travas.setdefault(chave, threading.Lock())
+
+    def _calcular(self, chave, calcular=None):
+        with self._trava_de(chave):
+            if chave not in self._derivados:
+                funcao, args = chave
+                if calcular is None:
+                    with desempenho.medir(f"derivar {funcao.__name__}"):
+                        self._derivados[chave] = funcao(self.tabela, *args)
+                else:
+                    with desempenho.medir(f"atualizar {funcao.__name__}"):
+                        self._derivados[chave] = calcular()
+        return self._derivados[chave]
+
+    def aquecer(self, anterior):
+        # Calcula o que as páginas pediram à versão anterior, sem contar como pedido;
+        # se esta versão veio de uma carga incremental, o que der é atualizado
+        pedidos = anterior._pedidos.copy()
+        calculados = anterior._derivados.copy()
+        delta = self.delta
+        if delta is not None and delta.base != anterior.versao:
+            delta = None
+        with desempenho.medir("aquecer"):
+            for chave in pedidos:
+                funcao, args = chave
+                atualizar = ATUALIZACOES.get(funcao)
+                if delta is None or atualizar is None or chave not in calculados:
+                    self._calcular(chave)
+                    continue
+                self._calcular(
+                    chave,
+                    lambda: atualizar(
+                        calculados[chave], self.tabela, delta.removidas, delta.adicionadas, *args
+                    ),
+                )
+
+
+def tipar_os(tabela):
+    return esquema.aplicar(tabela, esquema.OS)
+
+
+def tipar_saldos(df):
+    df = df[
+        ~df["VALOR"].astype(str).str.contains("nan|http")
+    ].copy()
+    df, rejeitados = esquema.aplicar(df, esquema.SALDOS)
+
+    df["MES_ANO"] = df["MES"].astype(str) + '/' + df["ANO"].astype(str)
+    # Primeiro dia do mês da nota, montado uma vez para os gráficos mensais
+    df["DATA MES"] = pd.to_datetime(
+        pd.DataFrame({"year": df["ANO"], "month": df["MES"], "day": 1}), errors="coerce"
+    )
+    return df, rejeitados
+
+
+def _do_disco(nome):
+    salvo = armazenamento.carregar_ultimo(nome)
+    if salvo is None:
+        return None
+    versao, carregado_em, tabela = salvo
+    return Snapshot(
+        versao=versao,
+        carregado_em=carregado_em,
+        tabela=tabela,
+        rejeitados=pd.DataFrame(columns=["coluna", "linha", "valor"]),
+    )
+
+
+def _baixar(nome, fonte, tipar, anterior=None):
+    atual = anterior.versao if anterior is not None else None
+    try:
+        with desempenho.medir("buscar"):
+            conteudo = fonte.buscar(atual)
+    except fontes.FonteIndisponivel:
+        # Com uma versão em memória, ela continua valendo com os derivados já
+        # calculados; o disco só serve quando o processo ainda não tem nenhuma
+        if anterior is not None:
+            logger.warning("Falha ao baixar %s; mantendo a versão %s", nome, anterior.versao)
+            return anterior
+        snapshot = _do_disco(nome)
+        if snapshot is None:
+            raise
+        logger.warning("Falha ao baixar %s; usando snapshot %s", nome, snapshot.versao)
+        return snapshot
+
+    # Nada mudou na origem: sem leitura, limpeza nem derivados
+    if conteudo is None:
+        return anterior
+    versao = fontes.versao(conteudo)
+    if versao == atual:
+        return anterior
+
+    chave = CHAVES.get(nome) if fonte.formato == "csv" else None
+    carga = None
+    if chave is not None and anterior is not None:
+        with desempenho.medir("carga incremental"):
+            carga = incremental.aplicar(conteudo, anterior, tipar, chave)
+    if carga is not None:
+        tabela, rejeitados, indice, delta = carga
+    else:
+        with desempenho.medir("ler"):
+            bruta = fonte.ler(conteudo)
+        indice, delta = None, None
+        if chave is not None:
+            with desempenho.medir("indexar"):
+                indice = incremental.indexar(conteudo, bruta)
+        with desempenho.medir("limpar"):
+            tabela, rejeitados = tipar(bruta)
+    snapshot = Snapshot(
+        versao=versao,
+        carregado_em=datetime.now(timezone("America/Sao_Paulo")),
+        tabela=tabela,
+        rejeitados=rejeitados,
+        indice=indice,
+        delta=delta,
+    )
+    try:
+        with desempenho.medir("gravar snapshot"):
+            armazenamento.salvar(
+                nome, snapshot.versao, snapshot.carregado_em, snapshot.tabela
+            )
+    except (OSError, ValueError) as e:
+        logger.warning("Não foi possível gravar o snapshot %s: %s", nome, e)
+    return snapshot
+
+
+PLANILHAS = {
+    "os": tipar_os,
+    "saldos": tipar_saldos,
+}
+FONTES = {nome: fontes.configurada(nome) for nome in PLANILHAS}
+
+
+def baixar(nome, anterior=None):
+    # No atualizador cada download vira um registro de desempenho próprio
+    with desempenho.medir(f"atualizar {nome}"):
+        return _baixar(nome, FONTES[nome], PLANILHAS[nome], anterior)
+
+
+def carregar(nome):
+    # A primeira carga do processo vem do snapshot em disco, se houver; o
+    # atualizador troca pela versão da planilha assim que a baixar
+    snapshot = _do_disco(nome)
+    if snapshot is not None:
+        return snapshot
+    return baixar(nome)
+
+
+def preparar(nome, snapshot):
+    for caminho in PREPARAR.get(nome, []):
+        modulo, funcao = caminho.split(":")
+        with desempenho.medir(f"preparar {caminho}"):
+            getattr(importlib.import_module(modulo), funcao)(snapshot)
+
+
+@st.cache_resource
+def _atualizador():
+    atualizador = Atualizador(
+        PLANILHAS, carregar, baixar, INTERVALO_ATUALIZACAO, preparar
+    )
+    atualizador.iniciar()
+    return atualizador
+
+
+def _atual(nome):
+    atualizador = _atualizador()
+    with desempenho.medir(f"dados {nome}"):
+        if atualizador.disponivel(nome):
+            return atualizador.atual(nome)
+        with st.spinner("Carregando dados..."):
+            return atualizador.atual(nome)
+
+
+def carregar_os():
+    return _atual("os")
+
+
+def carregar_saldos():
+    return _atual("saldos")
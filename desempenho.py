@@ -0,0 +1,105 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import streamlit as st
+
+# Arquivo JSONL com uma linha por renderização de página ou atualização de
+# planilha; vazio desliga o registro
+ARQUIVO = os.environ.get("GENPAC_LOG_DESEMPENHO", "./logs/desempenho.jsonl")
+MAXIMO_BYTES = int(os.environ.get("GENPAC_LOG_DESEMPENHO_MAXIMO", str(10 * 1024 * 1024)))
+
+logger = logging.getLogger(__name__)
+
+_atual = contextvars.ContextVar("medicao", default=None)
+_trava = threading.Lock()
+
+
+@dataclass
+class Medicao:
+    nome: str
+    inicio: float
+    quando: datetime
+    etapas: list = field(default_factory=list)
+    total_ms: float = None
+    _nivel: int = 0
+
+
+@contextmanager
+def medir(nome):
+    # Fora de uma medição abre um registro novo; dentro de uma, vira uma etapa dela
+    medicao = _atual.get()
+    if medicao is None:
+        medicao = Medicao(nome, time.perf_counter(), datetime.now())
+        token = _atual.set(medicao)
+        try:
+            yield medicao
+        finally:
+            _atual.reset(token)
+            medicao.total_ms = round((time.perf_counter() - medicao.inicio) * 1000, 2)
+            _registrar(medicao)
+        return
+
+    etapa = {"nome": nome, "nivel": medicao._nivel, "ms": None}
+    medicao.etapas.append(etapa)
+    medicao._nivel += 1
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    finally:
+        medicao._nivel -= 1
+        etapa["ms"] = round((time.perf_counter() - inicio) * 1000, 2)
+
+
+def _registrar(medicao):
+    if not ARQUIVO:
+        return
+    registro = {
+        "quando": medicao.quando.isoformat(timespec="milliseconds"),
+        "nome": medicao.nome,
+        "total_ms": medicao.total_ms,
+        "etapas": medicao.etapas,
+    }
+    try:
+        with _trava:
+            os.makedirs(os.path.dirname(ARQUIVO) or ".", exist_ok=True)
+            if os.path.exists(ARQUIVO) and os.path.getsize(ARQUIVO) > MAXIMO_BYTES:
+                os.replace(ARQUIVO, ARQUIVO + ".1")
+            with open(ARQUIVO, "a", encoding="utf-8") as arquivo:
+                arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.warning("Não foi possível registrar o desempenho em %s: %s", ARQUIVO, e)
+
+
+def resumo(medicao):
+    # Etapas de mesmo nome e nível somadas; o que nenhuma etapa cobre é a
+    # emissão dos elementos do Streamlit. O pandas só é importado aqui: contrato.py
+    # usa este módulo antes de qualquer página ter carregado o pandas
+    import pandas as pd
+
+    tabela = pd.DataFrame(medicao.etapas, columns=["nome", "nivel", "ms"])
+    tabela = (
+        tabela.groupby(["nivel", "nome"], sort=False)["ms"]
+        .agg(["sum", "count"])
+        .reset_index()
+        .rename(columns={"sum": "ms", "count": "vezes"})
+    )
+    medido = tabela.loc[tabela["nivel"] == 0, "ms"].sum()
+    outros = pd.DataFrame(
+        [{"nivel": 0, "nome": "outros (elementos)", "ms": medicao.total_ms - medido, "vezes": 1}]
+    )
+    tabela = pd.concat([tabela, outros], ignore_index=True)
+    tabela["etapa"] = tabela["nivel"].map(lambda nivel: "· " * nivel) + tabela["nome"]
+    return tabela[["etapa", "ms", "vezes"]].round({"ms": 1})
+
+
+def painel(medicao):
+    with st.sidebar.expander("Desempenho", expanded=True):
+        st.caption(f"{medicao.nome}: {medicao.total_ms:.0f} ms")
+        st.dataframe(resumo(medicao), hide_index=True, use_container_width=True)
@@ -0,0 +1,96 @@
+import logging
+
+import pandas as pd
+
+from contratos import CONTRATOS
+from moeda import converter_colunas
+
+# Tipos declarados das colunas das planilhas. Colunas fora do esquema viram
+# categoria quando têm poucos valores distintos e texto Arrow nos demais casos.
+OS = {
+    "OS": "texto",
+    "CONTRATO": "categoria",
+    "STATUS*": "categoria",
+    "DISCIPLINAS": "categoria",
+    "ORÇAMENTISTA": "categoria",
+    "RESPONSAVEL TÉCNICO": "categoria",
+    "DATA RECEBIDO": "data",
+    "DATA FINALIZADO": "data",
+    "DATA ORÇADO": "data",
+    "VALOR ORÇADO": "moeda",
+    "VALOR INSUMO": "moeda",
+    "VALOR MÃO DE OBRA": "moeda",
+}
+
+SALDOS = {
+    "LOTE": "categoria",
+    "STATUS": "categoria",
+    "VALOR": "moeda",
+    # Uma coluna de saldo por contrato do registro
+    **{contrato.coluna_saldo: "moeda" for contrato in CONTRATOS},
+}
+
+FORMATO_DATA = "%d/%m/%Y"
+# Partes de cada coluna de data guardadas como chaves inteiras na carga:
+# "DATA RECEBIDO" ganha "ANO RECEBIDO", "MES RECEBIDO" e "DIA RECEBIDO"
+PARTES_DATA = {"ANO": ("year", "Int16"), "MES": ("month", "Int8"), "DIA": ("day", "Int8")}
+PROPORCAO_CATEGORIA = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def colunas(esquema, tipo):
+    return [coluna for coluna, tipo_coluna in esquema.items() if tipo_coluna == tipo]
+
+
+def chave_data(coluna, parte):
+    return f"{parte} {coluna.removeprefix('DATA ')}"
+
+
+def _tipo_livre(serie):
+    if serie.dtype != object:
+        return None
+    if serie.nunique() <= PROPORCAO_CATEGORIA * len(serie):
+        return "categoria"
+    return "texto"
+
+
+def aplicar(tabela, esquema):
+    if logger.isEnabledFor(logging.DEBUG):
+        antes = tabela.memory_usage(deep=True, index=False)
+
+    for coluna in tabela.columns:
+        tipo = esquema.get(coluna) or _tipo_livre(tabela[coluna])
+        if tipo == "categoria":
+            tabela[coluna] = tabela[coluna].astype("category")
+        elif tipo == "texto":
+            tabela[coluna] = tabela[coluna].astype("string[pyarrow]")
+        elif tipo == "data":
+            tabela[coluna] = pd.to_datetime(
+                tabela[coluna], format=FORMATO_DATA, errors="coerce"
+            )
+    # As datas são convertidas só aqui; as páginas usam as partes já prontas
+    for coluna in colunas(esquema, "data"):
+        if coluna in tabela.columns:
+            for parte, (atributo, tipo) in PARTES_DATA.items():
+                valores = getattr(tabela[coluna].dt, atributo)
+                tabela[chave_data(coluna, parte)] = valores.astype(tipo)
+    tabela, rejeitados = converter_colunas(tabela, colunas(esquema, "moeda"))
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Memória por coluna:\n%s", relatorio_memoria(antes, tabela))
+    return tabela, rejeitados
+
+
+def relatorio_memoria(antes, tabela):
+    depois = tabela.memory_usage(deep=True, index=False)
+    relatorio = pd.DataFrame(
+        {
+            "tipo": tabela.dtypes.astype(str),
+            "antes_bytes": antes,
+            "depois_bytes": depois,
+        }
+    )
+    relatorio.loc["TOTAL"] = ["", antes.sum(), depois.sum()]
+    relatorio["reducao"] = relatorio["antes_bytes"] / relatorio["depois_bytes"]
+    return relatorio
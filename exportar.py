@@ -0,0 +1,118 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import fontes
+from contratos import CONTRATOS, resultados
+from dados import PLANILHAS
+from indicadores import contar_disciplinas_finalizadas, contar_ocorrencias, montar_metricas
+from saldos import summarize_balances
+from Valor_contrato import calculate_metrics, summarize_budgets
+
+COLUNAS = ["data", "pagina", "contrato", "indicador", "valor"]
+
+# Tabelas e derivados que não dependem da data, preparados uma vez por processo
+_preparado = {}
+
+
+def carregar():
+    # Lê as planilhas direto da fonte configurada, sem Streamlit nem atualizador
+    tabelas = {}
+    for nome, tipar in PLANILHAS.items():
+        fonte = fontes.configurada(nome)
+        tabelas[nome], _ = tipar(fonte.ler(fonte.buscar()))
+    return tabelas
+
+
+def preparar(tabelas):
+    _preparado["os"] = tabelas["os"]
+    _preparado["saldos"] = tabelas["saldos"]
+    _preparado["resultados"] = resultados(contar_ocorrencias(tabelas["os"]))
+    _preparado["orcamentos"] = summarize_budgets(tabelas["os"])
+
+
+def _relatorio_diario(data):
+    tabela = _preparado["os"]
+    metricas = montar_metricas(tabela, data).stack()
+    for (contrato, indicador), valor in metricas.items():
+        yield "relatorio_diario", contrato, indicador, valor
+    siglas = {contrato.id: contrato.sigla for contrato in CONTRATOS}
+    for (contrato, grupo, coluna), valor in _preparado["resultados"].stack().items():
+        yield "relatorio_diario", contrato, f"{grupo} {siglas[contrato]} {coluna}", valor
+    disciplinas = contar_disciplinas_finalizadas(tabela, data)
+    for disciplina, quantidade in zip(disciplinas["Disciplina"], disciplinas["Quantidade"]):
+        yield "relatorio_diario", None, f"finalizadas no dia {disciplina}", quantidade
+
+
+def _orcamentos(data):
+    metricas = calculate_metrics(_preparado["orcamentos"], data)
+    valores = metricas.stack([0, 1], future_stack=True)
+    for (contrato, periodo, coluna), valor in valores.items():
+        yield "orcamentos", contrato, f"{periodo} {coluna}", valor
+
+
+def _saldos(data):
+    # Saldos na data: as notas fiscais lançadas até o mês dela
+    tabela = _preparado["saldos"]
+    ate_o_mes = tabela["DATA MES"] <= pd.Timestamp(data.year, data.month, 1)
+    lotes, geral = summarize_balances(tabela[ate_o_mes])
+    for (contrato, indicador), valor in lotes.stack().items():
+        yield "saldos", contrato, indicador, valor
+    for indicador, valor in geral.items():
+        yield "saldos", None, indicador, valor
+
+
+def indicadores_do_dia(data):
+    data = pd.Timestamp(data).date()
+    return [
+        (data.isoformat(), *linha)
+        for gerar in (_relatorio_diario, _orcamentos, _saldos)
+        for linha in gerar(data)
+    ]
+
+
+def exportar(tabelas, datas, processos=1):
+    # Cada processo recebe as tabelas uma vez e calcula um bloco de datas
+    if processos <= 1 or len(datas) <= 1:
+        preparar(tabelas)
+        linhas = map(indicadores_do_dia, datas)
+        return pd.DataFrame([linha for dia in linhas for linha in dia], columns=COLUNAS)
+    bloco = max(1, len(datas) // (processos * 4))
+    with ProcessPoolExecutor(
+        max_workers=processos, initializer=preparar, initargs=(tabelas,)
+    ) as executor:
+        linhas = executor.map(indicadores_do_dia, datas, chunksize=bloco)
+        return pd.DataFrame([linha for dia in linhas for linha in dia], columns=COLUNAS)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Exporta os indicadores do Relatório Diário, Orçamentos e Saldos "
+            "de uma data ou de um intervalo de datas, sem abrir o Streamlit"
+        )
+    )
+    parser.add_argument("inicio", help="data no formato AAAA-MM-DD")
+    parser.add_argument("fim", nargs="?", help="última data do intervalo, inclusive")
+    parser.add_argument("--formato", choices=["json", "csv"], default="json")
+    parser.add_argument("--saida", help="arquivo de saída; sem ele, a saída padrão")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    datas = list(pd.date_range(args.inicio, args.fim or args.inicio, freq="D"))
+    if not datas:
+        parser.error("a data final vem antes da inicial")
+    resultado = exportar(carregar(), datas, args.processos)
+
+    saida = args.saida or sys.stdout
+    if args.formato == "csv":
+        resultado.to_csv(saida, index=False)
+    else:
+        resultado.to_json(saida, orient="records", force_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
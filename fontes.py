@@ -0,0 +1,247 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+import requests
+import tenacity
+from requests.adapters import HTTPAdapter
+
+# Origem de cada planilha, trocável pelas variáveis GENPAC_FONTE_OS e
+# GENPAC_FONTE_SALDOS:
+#   gsheets:<id da planilha>[#gid]    exportação CSV de uma planilha Google
+#   http://localhost:8000/os.csv      qualquer servidor HTTP, inclusive local
+#   /dados/os.csv, /dados/os.parquet  arquivo gravado ou sintético
+PADROES = {
+    "os": "gsheets:1vp62n11C8Gnx9QMHL08QofGnNdlt08P54EJ7bkOHVaE",
+    "saldos": (
+        "https://docs.google.com/spreadsheets/d/e/2PACX-1vSlTQoxa_YIMgRHv5x-"
+        "URXirElC2efKea8CKK4U2qhqIKJPg_Zgv6IKZFVRCMNhYlohC0la69ueAyL_/"
+        "pub?gid=713266789&single=true&output=csv"
+    ),
+}
+
+
+# Segundos para abrir a conexão e para esperar cada bloco da resposta
+TEMPO_CONEXAO = float(os.environ.get("GENPAC_FONTE_TEMPO_CONEXAO", "5"))
+TEMPO_LEITURA = float(os.environ.get("GENPAC_FONTE_TEMPO_LEITURA", "30"))
+TENTATIVAS = int(os.environ.get("GENPAC_FONTE_TENTATIVAS", "4"))
+BLOCO = 1 << 16
+# Respostas que valem nova tentativa: limite de taxa e falhas passageiras do servidor
+STATUS_TRANSITORIOS = {429, 500, 502, 503, 504}
+
+logger = logging.getLogger(__name__)
+
+_sessao = None
+# fonte -> contadores das buscas, compartilhado pelo processo
+_metricas = {}
+_trava = threading.Lock()
+
+
+class FonteIndisponivel(Exception):
+    pass
+
+
+def sessao():
+    # Uma sessão por processo: as conexões com a origem ficam abertas entre as buscas
+    global _sessao
+    with _trava:
+        if _sessao is None:
+            _sessao = requests.Session()
+            _sessao.headers["Accept-Encoding"] = "gzip"
+            adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            _sessao.mount("https://", adaptador)
+            _sessao.mount("http://", adaptador)
+        return _sessao
+
+
+def _transitorio(erro):
+    if isinstance(erro, requests.HTTPError):
+        return erro.response is not None and erro.response.status_code in STATUS_TRANSITORIOS
+    transitorios = (
+        requests.ConnectionError,
+        requests.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+    )
+    return isinstance(erro, transitorios)
+
+
+def versao(conteudo):
+    # Assinatura do conteúdo bruto: a mesma versão não é lida de novo
+    return hashlib.sha1(conteudo).hexdigest()[:12]
+
+
+def _registrar(fonte, inicio, tentativas, conteudo=None, erro=None):
+    ms = (time.perf_counter() - inicio) * 1000
+    with _trava:
+        contagem = _metricas.setdefault(
+            fonte,
+            {
+                "buscas": 0,
+                "inalteradas": 0,
+                "falhas": 0,
+                "tentativas": 0,
+                "bytes": 0,
+                "total_ms": 0.0,
+            },
+        )
+        contagem["buscas"] += 1
+        contagem["tentativas"] += tentativas
+        contagem["total_ms"] += ms
+        contagem["ultima_ms"] = ms
+        if erro is not None:
+            contagem["falhas"] += 1
+            contagem["ultimo_erro"] = str(erro)
+        elif conteudo is None:
+            contagem["inalteradas"] += 1
+        else:
+            contagem["bytes"] = len(conteudo)
+
+
+def metricas():
+    with _trava:
+        return {fonte: dict(contagem) for fonte, contagem in _metricas.items()}
+
+
+def _formato(caminho):
+    extensao = os.path.splitext(caminho.split("?")[0])[1].lower()
+    return "parquet" if extensao in (".parquet", ".pq") else "csv"
+
+
+class Fonte:
+    formato = "csv"
+    # Nome da planilha, usado nas métricas; fica vazio para fontes avulsas
+    nome = None
+
+    def buscar(self, atual=None):
+        # Devolve o conteúdo bruto, ou None quando a origem garante que ele
+        # ainda é o da versão `atual` que o chamador já tem
+        raise NotImplementedError
+
+    def ler(self, conteudo):
+        if self.formato == "parquet":
+            return pd.read_parquet(io.BytesIO(conteudo))
+        return pd.read_csv(io.BytesIO(conteudo))
+
+
+class FonteHTTP(Fonte):
+    def __init__(self, url):
+        self.url = url
+        self.formato = _formato(url)
+        # (versão, ETag, Last-Modified) da última resposta completa
+        self._validadores = (None, None, None)
+
+    def buscar(self, atual=None):
+        # Falhas passageiras são repetidas com espera exponencial e aleatória,
+        # para que várias buscas não voltem à origem ao mesmo tempo
+        rotulo = self.nome or self.url
+        inicio = time.perf_counter()
+        tentativas = tenacity.Retrying(
+            stop=tenacity.stop_after_attempt(TENTATIVAS),
+            wait=tenacity.wait_random_exponential(multiplier=0.5, max=10),
+            retry=tenacity.retry_if_exception(_transitorio),
+            before_sleep=self._avisar,
+            reraise=True,
+        )
+        try:
+            conteudo = tentativas(self._baixar, atual)
+        except requests.RequestException as e:
+            _registrar(rotulo, inicio, tentativas.statistics["attempt_number"], erro=e)
+            raise FonteIndisponivel(f"{self.url}: {e}") from e
+        _registrar(rotulo, inicio, tentativas.statistics["attempt_number"], conteudo)
+        return conteudo
+
+    def _baixar(self, atual):
+        # A pergunta é condicional só se os validadores guardados são da versão
+        # que o chamador tem; se a origem não os suporta, a resposta vem inteira
+        cabecalhos = {}
+        versao_validada, etag, modificado = self._validadores
+        if atual is not None and versao_validada == atual:
+            if etag:
+                cabecalhos["If-None-Match"] = etag
+            if modificado:
+                cabecalhos["If-Modified-Since"] = modificado
+        # A resposta chega em blocos, cada um dentro do tempo de leitura
+        with sessao().get(
+            self.url,
+            headers=cabecalhos,
+            timeout=(TEMPO_CONEXAO, TEMPO_LEITURA),
+            stream=True,
+        ) as resposta:
+            if resposta.status_code == 304 and cabecalhos:
+                return None
+            resposta.raise_for_status()
+            conteudo = io.BytesIO()
+            for bloco in resposta.iter_content(BLOCO):
+                conteudo.write(bloco)
+            conteudo = conteudo.getvalue()
+            self._validadores = (
+                versao(conteudo),
+                resposta.headers.get("ETag"),
+                resposta.headers.get("Last-Modified"),
+            )
+            return conteudo
+
+    def _avisar(self, estado):
+        logger.warning(
+            "Tentativa %d de buscar %s falhou (%s); repetindo",
+            estado.attempt_number,
+            self.nome or self.url,
+            estado.outcome.exception(),
+        )
+
+    def __repr__(self):
+        return f"FonteHTTP({self.url!r})"
+
+
+class FonteGoogleSheets(FonteHTTP):
+    def __init__(self, planilha, gid=None):
+        url = f"https://docs.google.com/spreadsheets/d/{planilha}/export?format=csv"
+        if gid is not None:
+            url += f"&gid={gid}"
+        super().__init__(url)
+
+
+class FonteArquivo(Fonte):
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.formato = _formato(caminho)
+        # (versão, mtime, tamanho) da última leitura
+        self._validadores = (None, None, None)
+
+    def buscar(self, atual=None):
+        try:
+            estado = os.stat(self.caminho)
+            if atual is not None and self._validadores == (
+                atual, estado.st_mtime_ns, estado.st_size
+            ):
+                return None
+            with open(self.caminho, "rb") as arquivo:
+                conteudo = arquivo.read()
+        except OSError as e:
+            raise FonteIndisponivel(f"{self.caminho}: {e}") from e
+        self._validadores = (versao(conteudo), estado.st_mtime_ns, estado.st_size)
+        return conteudo
+
+    def __repr__(self):
+        return f"FonteArquivo({self.caminho!r})"
+
+
+def de_uri(uri):
+    if uri.startswith("gsheets:"):
+        planilha, _, gid = uri[len("gsheets:"):].partition("#")
+        return FonteGoogleSheets(planilha, gid or None)
+    if uri.startswith(("http://", "https://")):
+        return FonteHTTP(uri)
+    if uri.startswith("file://"):
+        uri = uri[len("file://"):]
+    return FonteArquivo(uri)
+
+
+def configurada(nome):
+    fonte = de_uri(os.environ.get(f"GENPAC_FONTE_{nome.upper()}", PADROES[nome]))
+    fonte.nome = nome
+    return fonte
@@ -1,917 +1,709 @@
+import functools
 import pandas as pd
 import streamlit as st
 import calendar
 import altair as alt
-
-def gerar_contrato():
-    st.write("---")
-
-    url = (
-        "https://docs.google.com/"
-        "spreadsheets/d/"
-        "1vp62n11C8Gnx9QMHL08QofGnNdlt08P54EJ7bkOHVaE/"
-        "export?format=csv"
+import desempenho
+import graficos
+import paginacao
+from contratos import CONTRATOS, IDS, resultados
+from cubo import contar, fatiar, montar_cubo, por_dia, por_mes
+from dados import carregar_os
+from vazao import media_diaria, montar_vazao, preencher, recortar
+
+# As datas ficam em datetime64 até a tela; o formato dia/mês/ano é só de exibição
+COLUNA_DIA = st.column_config.DateColumn(format="DD/MM/YYYY")
+
+COLUNAS_FINALIZADAS = [
+    "OS",
+    "DATA RECEBIDO",
+    "DATA FINALIZADO",
+    "DISCIPLINAS",
+    "RESPONSAVEL TÉCNICO",
+]
+
+
+def fragmento(secao):
+    # Cada seção é um fragmento: mudar um filtro dela reexecuta só a seção,
+    # com o cubo recebido na última execução completa da página
+    @functools.wraps(secao)
+    def executar(*args):
+        with desempenho.medir(secao.__name__):
+            try:
+                secao(*args)
+            except Exception as e:
+                st.error(f"Ocorreu um erro ao exibir a seção: {e}")
+
+    return st.experimental_fragment(executar)
+
+
+def tabela_finalizadas(tabela):
+    # OS com data de finalização e o total de OS finalizadas no mesmo dia, geral e
+    # na disciplina da OS: a junção da Tabela de OS Finalizadas, montada uma vez por snapshot
+    finalizadas = tabela.loc[tabela["DATA FINALIZADO"].notna(), COLUNAS_FINALIZADAS]
+    finalizadas = finalizadas.reset_index(drop=True)
+    finalizadas["TOTAL DO DIA"] = finalizadas.groupby("DATA FINALIZADO").transform("size")
+    finalizadas["TOTAL DO DIA NA DISCIPLINA"] = finalizadas.groupby(
+        ["DATA FINALIZADO", "DISCIPLINAS"], observed=True, dropna=False
+    ).transform("size")
+    return finalizadas
+
+
+def finalizadas_por_dia(fatia):
+    return por_dia(fatia).rename_axis("DATA FINALIZADO").reset_index(
+        name="QUANTIDADE"
     )
 
-    try:
-        tabela = pd.read_csv(url, parse_dates=["DATA RECEBIDO"], dayfirst=True)
 
-        contratos_interesse = ["0100215/2023", "0200215/2023"]
-        filtro_contratos = tabela["CONTRATO"].isin(contratos_interesse)
-        dados_filtrados = tabela[filtro_contratos]
+def exibir_container1(titulo, abertas, finalizadas, percentual, cor):
+    st.markdown(
+        f'<p class="small-font"><strong>{titulo}</strong></p>',
+        unsafe_allow_html=True,
+    )
+    st.write(f"Abertas: {abertas}")
+    st.write(f"Finalizadas: {finalizadas}")
+    st.write(f"Percentual: {percentual:.2f}%")
+    st.progress(percentual / 100.0)
+
+
+@fragmento
+def secao_totais(cubo):
+    contagem_os = (
+        cubo.totais.groupby("CONTRATO", observed=True)["QUANTIDADE"]
+        .sum()
+        .reindex(IDS, fill_value=0)
+    )
 
-        contagem_os = dados_filtrados["CONTRATO"].value_counts()
+    total_os = contagem_os.sum()
 
-        total_os = contagem_os.sum()
+    st.subheader("Total de Ordens de Serviços recebidas por Contrato")
 
-        st.subheader("Total de Ordens de Serviços recebidas por Contrato")
+    total_os_junho = contar(fatiar(cubo, "recebido", "2024-06-01", "2024-06-30"))
 
-        tabela["DATA RECEBIDO"] = pd.to_datetime(
-            tabela["DATA RECEBIDO"], format="%d/%m/%Y", dayfirst=True, errors="coerce"
-        )
+    # Gráfico, um total por contrato do registro, Junho e Total Geral
+    col1, *cols_contratos, col4, col5 = st.columns(len(CONTRATOS) + 3, gap="small")
 
-        tabela["DATA FINALIZADO"] = pd.to_datetime(
-            tabela["DATA FINALIZADO"], format="%d/%m/%Y", dayfirst=True, errors="coerce"
+    with col1:
+        data_pie = pd.DataFrame(
+            {"Contrato": IDS, "Quantidade": contagem_os.to_numpy()}
         )
 
-        junho_2024 = tabela[
-            (tabela["DATA RECEBIDO"].dt.month == 6) & (tabela["DATA RECEBIDO"].dt.year == 2024)
-        ]
-        total_os_junho = junho_2024.shape[0]
-
-        col1, col2, col3, col4, col5 = st.columns(5, gap="small")
-
-        with col1:
-            data_pie = pd.DataFrame(
-                {
-                    "Contrato": contratos_interesse,
-                    "Quantidade": [
-                        contagem_os.get(contratos_interesse[0], 0),
-                        contagem_os.get(contratos_interesse[1], 0),
-                    ],
-                }
-            )
-
-            pie_chart = (
-                alt.Chart(data_pie)
-                .mark_arc(innerRadius=50)
-                .encode(
-                    theta=alt.Theta(field="Quantidade", type="quantitative"),
-                    color=alt.Color(field="Contrato", type="nominal"),
-                    tooltip=["Contrato", "Quantidade"],
-                )
-                .properties(width=150, height=150)
+        pie_chart = (
+            alt.Chart(data_pie)
+            .mark_arc(innerRadius=50)
+            .encode(
+                theta=alt.Theta(field="Quantidade", type="quantitative"),
+                color=alt.Color(field="Contrato", type="nominal"),
+                tooltip=["Contrato", "Quantidade"],
             )
+            .properties(width=150, height=150)
+        )
 
+        with desempenho.medir("gráfico"):
             st.altair_chart(pie_chart, use_container_width=True)
 
-        with col2:
-            contrato_1 = contratos_interesse[0]
-            count_1 = contagem_os.get(contrato_1, 0)
+    for col, contrato in zip(cols_contratos, CONTRATOS):
+        with col:
             st.markdown(
-                f"<div style='font-size:18px; text-align:center; color:#FFFAFA;font-weight:bold;'>Lote1 {contrato_1}</div>",
+                f"<div style='font-size:18px; text-align:center; color:#FFFAFA;font-weight:bold;'>{contrato.rotulo} {contrato.id}</div>",
                 unsafe_allow_html=True,
             )
             st.markdown(
-                f"<div style='font-size:36px; text-align:center; color:#1E90FF;font-weight:bold;'>{count_1}</div>",
+                f"<div style='font-size:36px; text-align:center; color:#1E90FF;font-weight:bold;'>{contagem_os[contrato.id]}</div>",
                 unsafe_allow_html=True,
             )
 
-        with col3:
-            contrato_2 = contratos_interesse[1]
-            count_2 = contagem_os.get(contrato_2, 0)
-            st.markdown(
-                f"<div style='font-size:18px; text-align:center; color:#FFFAFA; font-weight:bold;'>Lote2 {contrato_2}</div>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                f"<div style='font-size:36px; text-align:center; color:#1E90FF; font-weight:bold;'>{count_2}</div>",
-                unsafe_allow_html=True,
-            )
+    with col5:
+        st.markdown(
+            f"<div style='font-size:28px; text-align:center; color:#FFFAFA; font-weight:bold;'>Total Geral</div>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            f"<div style='font-size:36px; text-align:center; color:#1E90FF; font-weight:bold;'>{total_os}</div>",
+            unsafe_allow_html=True,
+        )
 
-        with col5:
-            st.markdown(
-                f"<div style='font-size:28px; text-align:center; color:#FFFAFA; font-weight:bold;'>Total Geral</div>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                f"<div style='font-size:36px; text-align:center; color:#1E90FF; font-weight:bold;'>{total_os}</div>",
-                unsafe_allow_html=True,
-            )
+    with col4:
+        st.markdown(
+            f"<div style='font-size:18px; text-align:center; color:#FFFAFA;font-weight:bold;'>Recebidas Junho 2024</div>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            f"<div style='font-size:36px; text-align:center; color:#FFD700;font-weight:bold;'>{total_os_junho}</div>",
+            unsafe_allow_html=True,
+        )
 
-        with col4:
-            st.markdown(
-                f"<div style='font-size:18px; text-align:center; color:#FFFAFA;font-weight:bold;'>Recebidas Junho 2024</div>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                f"<div style='font-size:36px; text-align:center; color:#FFD700;font-weight:bold;'>{total_os_junho}</div>",
-                unsafe_allow_html=True,
-            )
+    st.write("---")
 
-        st.write("---")
 
-        dados_filtrados = tabela[(tabela["DATA RECEBIDO"].dt.year.isin([2023, 2024]))]
+@fragmento
+def secao_os_por_mes(cubo):
+    dados_filtrados = fatiar(cubo, "recebido", "2023-01-01", "2024-12-31")
 
-        col4, col5 = st.columns([5, 1])
+    col4, col5 = st.columns([5, 1])
 
-        with col5:
-            st.write("Selecionar Período")
-            inicio_mes = st.selectbox(
-                "Mês Inicial", range(1, 13), 0, key="inicio_mes1")
-            inicio_ano = st.selectbox(
-                "Ano Inicial", [2023, 2024], 0, key="inicio_ano1")
-            fim_mes = st.selectbox(
-                "Mês Final", range(1, 13), 11, key="fim_mes1")
-            fim_ano = st.selectbox(
-                "Ano Final", [2023, 2024], 1, key="fim_ano1")
+    with col5:
+        st.write("Selecionar Período")
+        inicio_mes = st.selectbox(
+            "Mês Inicial", range(1, 13), 0, key="inicio_mes1")
+        inicio_ano = st.selectbox(
+            "Ano Inicial", [2023, 2024], 0, key="inicio_ano1")
+        fim_mes = st.selectbox(
+            "Mês Final", range(1, 13), 11, key="fim_mes1")
+        fim_ano = st.selectbox(
+            "Ano Final", [2023, 2024], 1, key="fim_ano1")
 
-        inicio_data = pd.Timestamp(year=inicio_ano, month=inicio_mes, day=1)
-        fim_data = pd.Timestamp(
-            year=fim_ano, month=fim_mes, day=calendar.monthrange(fim_ano, fim_mes)[1]
+    inicio_data = pd.Timestamp(year=inicio_ano, month=inicio_mes, day=1)
+    fim_data = pd.Timestamp(
+        year=fim_ano, month=fim_mes, day=calendar.monthrange(fim_ano, fim_mes)[1]
+    )
+    dados_selecionados = dados_filtrados.loc[inicio_data:fim_data]
+
+    with desempenho.medir("gráfico"):
+        graficos.exibir_serie(
+            por_mes(dados_selecionados),
+            "DATA RECEBIDO",
+            "Quantidade de OS",
+            minimo="M",
+            container=col4,
+            cor="#FF0000",
+            titulo=f"Quantidade de (OS) recebidas por Mês ({inicio_mes}/{inicio_ano} a {fim_mes}/{fim_ano})",
+            rotulo_x="MES",
         )
-        dados_selecionados = dados_filtrados[
-            (dados_filtrados["DATA RECEBIDO"] >= inicio_data) & (dados_filtrados["DATA RECEBIDO"] <= fim_data)
-        ]
 
-        os_por_mes = (
-            dados_selecionados.groupby(
-                dados_selecionados["DATA RECEBIDO"].dt.to_period("M")
-            )
-            .size()
-            .reset_index(name="Quantidade de OS")
-        )
+    st.write("---")
 
-        os_por_mes["MES"] = os_por_mes["DATA RECEBIDO"].dt.strftime("%b %Y")
 
-        chart = (
-            alt.Chart(os_por_mes)
-            .mark_bar()
-            .encode(
-                x="MES",
-                y="Quantidade de OS",
-                color=alt.value("#FF0000"),
-            )
-            .properties(
-                title=f"Quantidade de (OS) recebidas por Mês ({inicio_mes}/{inicio_ano} a {fim_mes}/{fim_ano})"
-            )
-        )
-        col4.altair_chart(chart, use_container_width=True)
+@fragmento
+def secao_os_por_dia(cubo):
+    dados_filtrados = fatiar(cubo, "recebido", "2023-01-01", "2024-12-31")
 
-        st.write("---")
+    col1, col2 = st.columns([1, 6])
+
+    with col1:
+        st.write("Selecionar Período")
+        inicio_data = st.date_input(
+            "Data Inicial", value=pd.to_datetime("2023-07-01"), key="inicio_data2"
+        )
+        fim_data = st.date_input(
+            "Data Final", value=pd.to_datetime("2025-12-31"), key="fim_data2"
+        )
 
-        col1, col2 = st.columns([1, 6])
+    dados_selecionados = dados_filtrados.loc[
+        pd.Timestamp(inicio_data):pd.Timestamp(fim_data)
+    ]
 
-        with col1:
-            st.write("Selecionar Período")
-            inicio_data = st.date_input(
-                "Data Inicial", value=pd.to_datetime("2023-07-01"), key="inicio_data2"
-            )
-            fim_data = st.date_input(
-                "Data Final", value=pd.to_datetime("2025-12-31"), key="fim_data2"
+    with col2:
+        st.subheader("Total de OS recebidas por dia")
+        with desempenho.medir("gráfico"):
+            graficos.exibir_serie(
+                por_dia(dados_selecionados), "DATA RECEBIDO", "QUANTIDADE", cor="#1E90FF"
             )
 
-        dados_selecionados = dados_filtrados[
-            (dados_filtrados["DATA RECEBIDO"] >= pd.to_datetime(inicio_data)) &
-            (dados_filtrados["DATA RECEBIDO"] <= pd.to_datetime(fim_data))
-        ]
+    st.write("---")
 
-        os_por_dia = (
-            dados_selecionados.groupby(
-                pd.to_datetime(dados_selecionados["DATA RECEBIDO"]).dt.date
-            )
-            .size()
-            .reset_index(name="QUANTIDADE")
+
+@fragmento
+def secao_os_por_disciplina(cubo):
+    col1, col2, col3 = st.columns([1, 6, 1])
+
+    with col3:
+        st.write("Selecionar Período")
+        inicio_data = st.date_input(
+            "Data Inicial", value=pd.to_datetime("2023-07-01"), key="inicio_data4"
+        )
+        fim_data = st.date_input(
+            "Data Final", value=pd.to_datetime("2025-12-31"), key="fim_data4"
         )
 
-        with col2:
-            st.subheader("Total de OS recebidas por dia")
-            chart = (
-                alt.Chart(os_por_dia)
-                .mark_bar(color="#1E90FF")
-                .encode(x="DATA RECEBIDO:T", y="QUANTIDADE:Q")
-                .properties(width=600, height=400)
-            )
-            st.altair_chart(chart, use_container_width=True)
+    disciplinas = ["Todas as disciplinas"] + cubo.opcoes["DISCIPLINAS"]
 
-        st.write("---")
+    with col1:
+        disciplina_selecionada = st.selectbox(
+            "Selecione a disciplina", disciplinas, key="disciplina_selecionada1"
+        )
 
-        col1, col2, col3 = st.columns([1, 6, 1])
+    dados_filtrados = fatiar(
+        cubo,
+        "recebido",
+        inicio_data,
+        fim_data,
+        {"DISCIPLINAS": disciplina_selecionada}
+        if disciplina_selecionada != "Todas as disciplinas"
+        else None,
+    )
 
-        with col3:
-            st.write("Selecionar Período")
-            inicio_data = st.date_input(
-                "Data Inicial", value=pd.to_datetime("2023-07-01"), key="inicio_data4"
-            )
-            fim_data = st.date_input(
-                "Data Final", value=pd.to_datetime("2025-12-31"), key="fim_data4"
+    total_os = contar(dados_filtrados)
+
+    with col2:
+        st.markdown(
+            f"<h4>Quantidade de OS recebidas por dia de <span style='color:#1E90FF;'>{inicio_data}</span> a <span style='color:#1E90FF;'>{fim_data}</span> - <span style='color:#1E90FF;'>{disciplina_selecionada}</span> (Total: <span style='color:#1E90FF;'>{total_os}</span>)</h4>",
+            unsafe_allow_html=True,
+        )
+        with desempenho.medir("gráfico"):
+            graficos.exibir_serie(
+                por_dia(dados_filtrados), "DATA RECEBIDO", "QUANTIDADE", cor="#FF0000"
             )
 
-        disciplinas = tabela["DISCIPLINAS"].unique().tolist()
-        disciplinas.insert(0, "Todas as disciplinas")
+    st.write("---")
 
-        with col1:
-            disciplina_selecionada = st.selectbox(
-                "Selecione a disciplina", disciplinas, key="disciplina_selecionada1"
-            )
 
-        dados_filtrados = tabela[
-            (tabela["DATA RECEBIDO"] >= pd.to_datetime(inicio_data)) &
-            (tabela["DATA RECEBIDO"] <= pd.to_datetime(fim_data))
-        ]
+@fragmento
+def secao_os_por_status(cubo):
+    col1, col2, col3 = st.columns([1, 6, 1])
 
-        if disciplina_selecionada != "Todas as disciplinas":
-            dados_filtrados = dados_filtrados[
-                dados_filtrados["DISCIPLINAS"] == disciplina_selecionada
-            ]
+    with col1:
+        st.write("Selecionar Período")
+        inicio_data = st.date_input(
+            "Data Inicial", value=pd.to_datetime("2023-07-01"), key="inicio_data5"
+        )
+        fim_data = st.date_input(
+            "Data Final", value=pd.to_datetime("2025-12-31"), key="fim_data5"
+        )
 
-        os_por_dia = (
-            dados_filtrados.groupby(
-                pd.to_datetime(dados_filtrados["DATA RECEBIDO"]).dt.date
-            )
-            .size()
-            .reset_index(name="QUANTIDADE")
+    with col3:
+        status_opcoes = ["Todos os status"] + cubo.opcoes["STATUS*"]
+        status_selecionado = st.selectbox(
+            "Selecione o status", status_opcoes, key="status_selecionado1"
         )
 
-        total_os = dados_filtrados.shape[0]
+    dados_filtrados_status = fatiar(
+        cubo,
+        "recebido",
+        inicio_data,
+        fim_data,
+        {"STATUS*": status_selecionado}
+        if status_selecionado != "Todos os status"
+        else None,
+    )
 
-        with col2:
-            st.markdown(
-                f"<h4>Quantidade de OS recebidas por dia de <span style='color:#1E90FF;'>{inicio_data}</span> a <span style='color:#1E90FF;'>{fim_data}</span> - <span style='color:#1E90FF;'>{disciplina_selecionada}</span> (Total: <span style='color:#1E90FF;'>{total_os}</span>)</h4>",
-                unsafe_allow_html=True,
-            )
-            chart = (
-                alt.Chart(os_por_dia)
-                .mark_bar(color="#FF0000")
-                .encode(x="DATA RECEBIDO:T", y="QUANTIDADE:Q")
-                .properties(width=600, height=400)
+    total_os_status = contar(dados_filtrados_status)
+
+    with col2:
+        st.markdown(
+            f"<h4>Quantidade de OS recebidas por dia de <span style='color:#1E90FF;'>{inicio_data}</span> a <span style='color:#1E90FF;'>{fim_data}</span> - <span style='color:#1E90FF;'>{status_selecionado}</span> (Total: <span style='color:#1E90FF;'>{total_os_status}</span>)</h4>",
+            unsafe_allow_html=True,
+        )
+        with desempenho.medir("gráfico"):
+            graficos.exibir_serie(
+                por_dia(dados_filtrados_status), "DATA RECEBIDO", "QUANTIDADE", cor="#1E90FF"
             )
-            st.altair_chart(chart, use_container_width=True)
 
-        st.write("---")
+    st.write("---")
 
-        col1, col2, col3 = st.columns([1, 6, 1])
 
-        with col1:
-            st.write("Selecionar Período")
-            inicio_data = st.date_input(
-                "Data Inicial", value=pd.to_datetime("2023-07-01"), key="inicio_data5"
-            )
-            fim_data = st.date_input(
-                "Data Final", value=pd.to_datetime("2025-12-31"), key="fim_data5"
-            )
+@fragmento
+def secao_resultados(cubo):
+    tabela = resultados(cubo.totais)
+    cores = ["blue", "green", "orange", "red"]
+    rotulos = {contrato.id: contrato.rotulo for contrato in CONTRATOS}
 
-        with col3:
-            status_opcoes = tabela["STATUS*"].unique().tolist()
-            status_opcoes.insert(0, "Todos os status")
-            status_selecionado = st.selectbox(
-                "Selecione o status", status_opcoes, key="status_selecionado1"
-            )
+    st.markdown('<link rel="stylesheet" href="styles.css">',
+                unsafe_allow_html=True)
 
-        dados_filtrados = tabela[
-            (tabela["DATA RECEBIDO"] >= pd.to_datetime(inicio_data)) &
-            (tabela["DATA RECEBIDO"] <= pd.to_datetime(fim_data))
-        ]
+    st.markdown(
+        '<p class="small-font"><strong>Resultados:</strong></p>',
+        unsafe_allow_html=True,
+    )
+    container = st.container()
+    with container:
+        # Quatro resultados por linha, na ordem do registro de contratos
+        for inicio in range(0, len(tabela), 4):
+            linhas = tabela.iloc[inicio:inicio + 4].itertuples()
+            for i, (col, linha) in enumerate(zip(st.columns(4), linhas), start=inicio):
+                contrato, grupo = linha.Index
+                with col:
+                    exibir_container1(
+                        f"{rotulos[contrato]} Contrato {contrato} - {grupo}",
+                        linha.abertas,
+                        linha.finalizadas,
+                        linha.percentual,
+                        cores[i % len(cores)],
+                    )
+        st.write("---")
 
-        if status_selecionado == "Todos os status":
-            dados_filtrados_status = dados_filtrados
-        else:
-            dados_filtrados_status = dados_filtrados[
-                dados_filtrados["STATUS*"] == status_selecionado
-            ]
 
-        os_por_dia_status = (
-            dados_filtrados_status.groupby(
-                pd.to_datetime(dados_filtrados_status["DATA RECEBIDO"]).dt.date
-            )
-            .size()
-            .reset_index(name="QUANTIDADE")
-        )
+@fragmento
+def secao_finalizadas_junho(cubo, vazao_os):
+    junho_2024_finalizado = fatiar(
+        cubo, "finalizado", "2024-06-01", "2024-06-30"
+    )
+
+    por_contrato = dict(
+        list(junho_2024_finalizado.groupby("CONTRATO", observed=True))
+    )
 
-        total_os_status = dados_filtrados_status.shape[0]
+    col1, *cols_contratos = st.columns([4] + [1] * len(CONTRATOS))
 
-        with col2:
+    for col, contrato in zip(cols_contratos, CONTRATOS):
+        with col:
             st.markdown(
-                f"<h4>Quantidade de OS recebidas por dia de <span style='color:#1E90FF;'>{inicio_data}</span> a <span style='color:#1E90FF;'>{fim_data}</span> - <span style='color:#1E90FF;'>{status_selecionado}</span> (Total: <span style='color:#1E90FF;'>{total_os_status}</span>)</h4>",
+                f'<p style="font-size: 13px; color: #FF0000;text-align: center;"><strong>OS Finalizadas Contrato {contrato.id}</strong></p>',
                 unsafe_allow_html=True,
             )
-            chart = (
-                alt.Chart(os_por_dia_status)
-                .mark_bar(color="#1E90FF")
-                .encode(x="DATA RECEBIDO:T", y="QUANTIDADE:Q")
-                .properties(width=600, height=400)
+            st.dataframe(
+                finalizadas_por_dia(
+                    por_contrato.get(contrato.id, junho_2024_finalizado.iloc[:0])
+                ),
+                column_config={"DATA FINALIZADO": COLUNA_DIA},
             )
-            st.altair_chart(chart, use_container_width=True)
-
-        st.write("---")
-
-        def calcular_percentual(abertas, finalizadas):
-            total = abertas + finalizadas
-            return (finalizadas / total) * 100 if total > 0 else 0
-
-        def exibir_container1(titulo, abertas, finalizadas, percentual, cor):
-            with st.container():
-                st.subheader(titulo)
-                st.write(f"Abertas: {abertas}")
-                st.write(f"Finalizadas: {finalizadas}")
-                st.write(f"Percentual: {percentual:.2f}%")
-                st.progress(percentual / 100.0)
-
-        def filtrar_ocorrencias(
-            disciplinas, status_aberto, status_finalizado, contrato
-        ):
-            abertas = tabela[
-                tabela["DISCIPLINAS"].isin(disciplinas)
-                & tabela["STATUS*"].isin(status_aberto)
-                & (tabela["CONTRATO"] == contrato)
-            ]
-            finalizadas = tabela[
-                tabela["DISCIPLINAS"].isin(disciplinas)
-                & tabela["STATUS*"].isin(status_finalizado)
-                & (tabela["CONTRATO"] == contrato)
-            ]
-            return len(abertas), len(finalizadas)
 
-        status_aberto = [
-            "RECEBIDO",
-            "ORÇADO",
-            "COMPRAS",
-            "EXECUÇÃO",
-            "VERIFICAR",
-            "PREVENTIVA",
-            "LEVANTAMENTO",
-            "EM ORÇAMENTO",
-            "EM ESPERA",
-            "PROGRAMADO",
-        ]
+    with col1:
+        st.markdown(
+            '<p class="font" style="font-size:26px;"><strong>OS Finalizadas por Dia em Junho de 2024</strong></p>',
+            unsafe_allow_html=True,
+        )
+        with desempenho.medir("gráfico"):
+            graficos.exibir_serie(
+                por_dia(junho_2024_finalizado), "DATA FINALIZADO", "QUANTIDADE", cor="#FF0000"
+            )
 
-        status_finalizado = ["FINALIZADO",
-                             "NOTA FISCAL", "EXECUTADO", "MEDIÇÃO"]
+    st.write("---")
 
-        disciplinas_civil = [
-            "ALVENARIA",
-            "HIDRÁULICA",
-            "CIVIL",
-            "COBERTURA",
-            "COMUNICAÇÃO VISUAL",
-            "DRYWALL",
-            "INSUMOS E EQUIPAMENTOS",
-            "IMPERMEABILIZAÇÃO",
-            "MARCENARIA",
-            "PINTURA",
-            "SERRALHERIA",
-            "VIDRAÇARIA",
-            "PERSIANA",
-            "EXTINTOR",
-        ]
+    # Médias por dia corrido, com zero nos dias sem OS finalizada
+    media_execucao_junho_2024 = recortar(vazao_os, "2024-06-01", "2024-06-30")
+    media_geral_junho_2024 = media_diaria(vazao_os, "2024-06-01", "2024-06-30")
+    media_geral_2023 = media_diaria(vazao_os, "2023-01-01", "2023-12-31")
+    media_geral_2024 = media_diaria(vazao_os, "2024-01-01", "2024-12-31")
 
-        abertas_0100215_civil, finalizadas_0100215_civil = filtrar_ocorrencias(
-            disciplinas_civil, status_aberto, status_finalizado, "0100215/2023"
-        )
-        percentual_0100215_civil = calcular_percentual(
-            abertas_0100215_civil, finalizadas_0100215_civil
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        st.markdown(
+            '<p style="font-size: 26px; color: #f9f9f9;"><strong>Média de Execução por Dia em Junho de 2024</strong></p>',
+            unsafe_allow_html=True,
         )
+        with desempenho.medir("gráfico"):
+            graficos.exibir_serie(
+                media_execucao_junho_2024,
+                "DATA FINALIZADO",
+                "QUANTIDADE",
+                marca="line",
+                cor="#1E90FF",
+                agregacao="mean",
+            )
+        st.markdown("</div>", unsafe_allow_html=True)
 
-        abertas_0100215_eletrica, finalizadas_0100215_eletrica = filtrar_ocorrencias(
-            ["ELÉTRICA"], status_aberto, status_finalizado, "0100215/2023"
+    with col2:
+        st.markdown(
+            '<p style="font-size: 18px; color: #f9f9f9;"><strong>Média Geral Junho 2024</strong></p>',
+            unsafe_allow_html=True,
         )
-        percentual_0100215_eletrica = calcular_percentual(
-            abertas_0100215_eletrica, finalizadas_0100215_eletrica
+        st.markdown(
+            f'<p style="font-size: 24px; color: #1E90FF;"><strong>{media_geral_junho_2024:.2f}</strong></p>',
+            unsafe_allow_html=True,
         )
+        st.markdown("</div>", unsafe_allow_html=True)
 
-        abertas_0200215_civil, finalizadas_0200215_civil = filtrar_ocorrencias(
-            disciplinas_civil, status_aberto, status_finalizado, "0200215/2023"
+        st.markdown(
+            '<p style="font-size: 18px; color:  #f9f9f9;"><strong>Média Geral 2023</strong></p>',
+            unsafe_allow_html=True,
         )
-        percentual_0200215_civil = calcular_percentual(
-            abertas_0200215_civil, finalizadas_0200215_civil
+        st.markdown(
+            f'<p style="font-size: 24px; color: #1E90FF;"><strong>{media_geral_2023:.2f}</strong></p>',
+            unsafe_allow_html=True,
         )
+        st.markdown("</div>", unsafe_allow_html=True)
 
-        abertas_0200215_eletrica, finalizadas_0200215_eletrica = filtrar_ocorrencias(
-            ["ELÉTRICA"], status_aberto, status_finalizado, "0200215/2023"
-        )
-        percentual_0200215_eletrica = calcular_percentual(
-            abertas_0200215_eletrica, finalizadas_0200215_eletrica
+        st.markdown(
+            '<p style="font-size: 18px; color:#f9f9f9;"><strong>Média Geral 2024</strong></p>',
+            unsafe_allow_html=True,
         )
-
-        st.markdown('<link rel="stylesheet" href="styles.css">',
-                    unsafe_allow_html=True)
-
-        def exibir_container1(titulo, abertas, finalizadas, percentual, cor):
-            st.markdown(
-                f'<p class="small-font"><strong>{titulo}</strong></p>',
-                unsafe_allow_html=True,
-            )
-            st.write(f"Abertas: {abertas}")
-            st.write(f"Finalizadas: {finalizadas}")
-            st.write(f"Percentual: {percentual:.2f}%")
-            st.progress(percentual / 100.0)
-
         st.markdown(
-            '<p class="small-font"><strong>Resultados:</strong></p>',
+            f'<p style="font-size: 24px; color: #1E90FF;"><strong>{media_geral_2024:.2f}</strong></p>',
             unsafe_allow_html=True,
         )
-        container = st.container()
-        with container:
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                exibir_container1(
-                    "Lote 01 Contrato 0100215/2023 - CIVIL",
-                    abertas_0100215_civil,
-                    finalizadas_0100215_civil,
-                    percentual_0100215_civil,
-                    "blue",
-                )
-
-            with col2:
-                exibir_container1(
-                    "Lote 01 Contrato 0100215/2023 - ELÉTRICA",
-                    abertas_0100215_eletrica,
-                    finalizadas_0100215_eletrica,
-                    percentual_0100215_eletrica,
-                    "green",
-                )
-
-            with col3:
-                exibir_container1(
-                    "Lote 02 Contrato 0200215/2023 - CIVIL",
-                    abertas_0200215_civil,
-                    finalizadas_0200215_civil,
-                    percentual_0200215_civil,
-                    "orange",
-                )
-
-            with col4:
-                exibir_container1(
-                    "Lote 02 Contrato 0200215/2023 - ELÉTRICA",
-                    abertas_0200215_eletrica,
-                    finalizadas_0200215_eletrica,
-                    percentual_0200215_eletrica,
-                    "red",
-                )
-            st.write("---")
-
-            junho_2024_finalizado = tabela[
-                (tabela["DATA FINALIZADO"].dt.month == 6) & (tabela["DATA FINALIZADO"].dt.year == 2024)
-            ]
-
-            junho_2024_finalizado["DATA FINALIZADO"] = pd.to_datetime(
-                junho_2024_finalizado["DATA FINALIZADO"].copy()
-            ).dt.strftime("%d/%m/%Y")
+        st.markdown("</div>", unsafe_allow_html=True)
 
-            finalizado_0100215 = junho_2024_finalizado[
-                junho_2024_finalizado["CONTRATO"] == "0100215/2023"
-            ]
-            finalizado_0200215 = junho_2024_finalizado[
-                junho_2024_finalizado["CONTRATO"] == "0200215/2023"
-            ]
-
-            os_finalizado_por_dia_0100215 = (
-                finalizado_0100215.groupby("DATA FINALIZADO")
-                .size()
-                .reset_index(name="QUANTIDADE")
-            )
-
-            os_finalizado_por_dia_0200215 = (
-                finalizado_0200215.groupby("DATA FINALIZADO")
-                .size()
-                .reset_index(name="QUANTIDADE")
-            )
-
-            os_finalizado_por_dia = (
-                junho_2024_finalizado.groupby("DATA FINALIZADO")
-                .size()
-                .reset_index(name="QUANTIDADE")
-            )
-
-            col1, col2, col3 = st.columns([4, 1, 1])
-
-            with col3:
-                st.markdown(
-                    '<p style="font-size: 13px; color:  #FF0000;text-align: center;"><strong>OS Finalizadas Contrato 0100215/2023</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                st.write(os_finalizado_por_dia_0100215)
-
-            with col2:
-                st.markdown(
-                    '<p style="font-size: 13px; color: #FF0000;text-align: center;"><strong>OS Finalizadas Contrato 0200215/2023</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                st.write(os_finalizado_por_dia_0200215)
-
-            with col1:
-                st.markdown(
-                    '<p class="font" style="font-size:26px;"><strong>OS Finalizadas por Dia em Junho de 2024</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                chart = (
-                    alt.Chart(os_finalizado_por_dia)
-                    .mark_bar(color="#FF0000")
-                    .encode(x="DATA FINALIZADO:T", y="QUANTIDADE:Q")
-                    .properties(width=600, height=400)
-                )
-                st.altair_chart(chart, use_container_width=True)
-
-            st.write("---")
-
-            def calcular_media_execucao_por_dia(df, ano):
-                df = df.copy()
-                df["DATA FINALIZADO"] = pd.to_datetime(df["DATA FINALIZADO"])
-                df_ano = df[df["DATA FINALIZADO"].dt.year == ano].copy()
-                df_ano.loc[:, "DATA FINALIZADO"] = df_ano[
-                    "DATA FINALIZADO"
-                ].dt.strftime("%d/%m/%Y")
-
-                os_finalizado_por_dia = (
-                    df_ano.groupby("DATA FINALIZADO")
-                    .size()
-                    .reset_index(name="QUANTIDADE")
-                )
-
-                media_execucao_por_dia = (
-                    os_finalizado_por_dia.groupby(
-                        "DATA FINALIZADO")["QUANTIDADE"]
-                    .mean()
-                    .reset_index(name="MEDIA_EXECUCAO")
-                )
-
-                media_geral_ano = media_execucao_por_dia["MEDIA_EXECUCAO"].mean(
-                )
-
-                return media_execucao_por_dia, media_geral_ano
-
-            junho_2024_finalizado = tabela[
-                (tabela["DATA FINALIZADO"].dt.month == 6) & (tabela["DATA FINALIZADO"].dt.year == 2024)
-            ]
-
-            media_execucao_junho_2024, media_geral_junho_2024 = (
-                calcular_media_execucao_por_dia(junho_2024_finalizado, 2024)
-            )
+    st.write("---")
 
-            media_execucao_2023, media_geral_2023 = calcular_media_execucao_por_dia(
-                tabela, 2023
-            )
 
-            media_execucao_2024, media_geral_2024 = calcular_media_execucao_por_dia(
-                tabela, 2024
-            )
-            col1, col2 = st.columns([5, 1])
-            with col1:
-                st.markdown(
-                    '<p style="font-size: 26px; color: #f9f9f9;"><strong>Média de Execução por Dia em Junho de 2024</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                chart = (
-                    alt.Chart(media_execucao_junho_2024)
-                    .mark_line(color="#1E90FF")
-                    .encode(x="DATA FINALIZADO:T", y="MEDIA_EXECUCAO:Q")
-                    .properties(width=600, height=400)
-                )
-                st.altair_chart(chart, use_container_width=True)
-                st.markdown("</div>", unsafe_allow_html=True)
-
-            with col2:
-                st.markdown(
-                    '<p style="font-size: 18px; color: #f9f9f9;"><strong>Média Geral Junho 2024</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                st.markdown(
-                    f'<p style="font-size: 24px; color: #1E90FF;"><strong>{media_geral_junho_2024:.2f}</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                st.markdown("</div>", unsafe_allow_html=True)
-
-                st.markdown(
-                    '<p style="font-size: 18px; color:  #f9f9f9;"><strong>Média Geral 2023</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                st.markdown(
-                    f'<p style="font-size: 24px; color: #1E90FF;"><strong>{media_geral_2023:.2f}</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                st.markdown("</div>", unsafe_allow_html=True)
-
-                st.markdown(
-                    '<p style="font-size: 18px; color:#f9f9f9;"><strong>Média Geral 2024</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                st.markdown(
-                    f'<p style="font-size: 24px; color: #1E90FF;"><strong>{media_geral_2024:.2f}</strong></p>',
-                    unsafe_allow_html=True,
-                )
-                st.markdown("</div>", unsafe_allow_html=True)
-
-            st.write("---")
-
-        col1, col2, col3 = st.columns([1, 4, 1])
-        with col1:
-            disciplinas = tabela["DISCIPLINAS"].unique().tolist()
-            disciplinas.insert(0, "Todas as disciplinas")
-            disciplina_selecionada = st.selectbox(
-                "Selecione a disciplina", disciplinas, key="disciplina_selecionada2"
-            )
+@fragmento
+def secao_finalizadas(cubo, finalizadas_os, vazao_os):
+    col1, col2, col3 = st.columns([1, 4, 1])
+    with col1:
+        disciplinas = ["Todas as disciplinas"] + cubo.opcoes["DISCIPLINAS"]
+        disciplina_selecionada = st.selectbox(
+            "Selecione a disciplina", disciplinas, key="disciplina_selecionada2"
+        )
 
-            inicio_data = st.date_input(
-                "Data Inicial", value=pd.to_datetime("2023-01-01"), key="data_inicial3"
-            )
-            fim_data = st.date_input(
-                "Data Final", value=pd.to_datetime("2024-12-31"), key="data_final3"
-            )
+        inicio_data = st.date_input(
+            "Data Inicial", value=pd.to_datetime("2023-01-01"), key="data_inicial3"
+        )
+        fim_data = st.date_input(
+            "Data Final", value=pd.to_datetime("2024-12-31"), key="data_final3"
+        )
 
-            if disciplina_selecionada != "Todas as disciplinas":
-                tabela = tabela[tabela["DISCIPLINAS"] == disciplina_selecionada]
+        filtro_disciplina = (
+            {"DISCIPLINAS": disciplina_selecionada}
+            if disciplina_selecionada != "Todas as disciplinas"
+            else None
+        )
+        finalizadas = fatiar(
+            cubo, "finalizado", inicio_data, fim_data, filtro_disciplina
+        )
 
-            tabela = tabela[
-                (
-                    tabela["DATA FINALIZADO"] >= pd.to_datetime(inicio_data)
-                ) & (
-                    tabela["DATA FINALIZADO"] <= pd.to_datetime(fim_data)
-                )
-            ]
+        total_os_finalizadas = contar(finalizadas)
 
-            os_finalizadas_por_dia = (
-                tabela.groupby(pd.to_datetime(tabela["DATA FINALIZADO"]).dt.date)
-                .size()
-                .reset_index(name="Quantidade")
+    with col2:
+        st.subheader(f"OS Finalizadas por Dia - {disciplina_selecionada}")
+        with desempenho.medir("gráfico"):
+            graficos.exibir_serie(
+                por_dia(finalizadas), "DATA FINALIZADO", "Quantidade", cor="#FF0000"
             )
 
-            total_os_finalizadas = os_finalizadas_por_dia["Quantidade"].sum()
-
-        with col2:
-            st.subheader(f"OS Finalizadas por Dia - {disciplina_selecionada}")
-            chart = (
-                alt.Chart(os_finalizadas_por_dia)
-                .mark_bar(color="#FF0000")
-                .encode(x="DATA FINALIZADO:T", y="Quantidade:Q")
-                .properties(width=600, height=400)
-            )
-            st.altair_chart(chart, use_container_width=True)
+    with col3:
+        st.markdown(
+            '<p style="font-size: 18px; color: #f9f9f9;"><strong>Total Finalizadas</strong></p>',
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            f'<p style="font-size: 28px; color: #1E90FF;"><strong>{total_os_finalizadas}</strong></p>',
+            unsafe_allow_html=True,
+        )
+        st.markdown("</div>", unsafe_allow_html=True)
+    st.write("---")
 
-        with col3:
-            st.markdown(
-                '<p style="font-size: 18px; color: #f9f9f9;"><strong>Total Finalizadas</strong></p>',
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                f'<p style="font-size: 28px; color: #1E90FF;"><strong>{total_os_finalizadas}</strong></p>',
-                unsafe_allow_html=True,
-            )
-            st.markdown("</div>", unsafe_allow_html=True)
-        st.write("---")
+    # A junção com o total do dia vem pronta do snapshot; aqui só se escolhem as linhas
+    linhas_finalizadas = finalizadas_os["DATA FINALIZADO"].between(
+        pd.Timestamp(inicio_data), pd.Timestamp(fim_data)
+    )
+    total_do_dia = "TOTAL DO DIA"
+    if filtro_disciplina:
+        linhas_finalizadas &= finalizadas_os["DISCIPLINAS"] == disciplina_selecionada
+        total_do_dia = "TOTAL DO DIA NA DISCIPLINA"
+    tabela_completa = finalizadas_os.loc[
+        linhas_finalizadas, COLUNAS_FINALIZADAS + [total_do_dia]
+    ].rename(columns={total_do_dia: "TOTAL DE OS DO DIA"}).reset_index(drop=True)
+
+    col4, col5, col6 = st.columns([4, 3, 1])
+
+    with col4:
+        st.subheader("Tabela de OS Finalizadas")
+        paginacao.exibir_paginada(tabela_completa, "finalizadas")
+
+    # As finalizadas do filtro nos dias corridos de junho de 2024
+    media_execucao_por_dia = preencher(
+        por_dia(finalizadas), recortar(vazao_os, "2024-06-01", "2024-06-30")
+    )
+    media_geral_junho_2024 = (
+        media_execucao_por_dia.mean() if len(media_execucao_por_dia) else 0.0
+    )
 
-        tabela_filtrada = tabela[
-            [
-                "OS",
-                "DATA RECEBIDO",
+    with col5:
+        st.markdown(
+            '<p style="font-size: 20px; color: #f9f9f9;"><strong>Média de Execução por Dia em Junho de 2024</strong></p>',
+            unsafe_allow_html=True,
+        )
+        with desempenho.medir("gráfico"):
+            graficos.exibir_serie(
+                media_execucao_por_dia,
                 "DATA FINALIZADO",
-                "DISCIPLINAS",
-                "RESPONSAVEL TÉCNICO",
-            ]
-        ]
+                "QUANTIDADE",
+                marca="line",
+                cor="#1E90FF",
+                agregacao="mean",
+            )
+        st.markdown("</div>", unsafe_allow_html=True)
 
-        os_por_dia = (
-            tabela.groupby("DATA FINALIZADO")
-            .size()
-            .reset_index(name="TOTAL DE OS DO DIA")
+    with col6:
+        st.markdown(
+            '<p style="font-size: 18px; color: #f9f9f9;"><strong>Média Geral</strong></p>',
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            f'<p style="font-size: 36px; color: #1E90FF;"><strong>{media_geral_junho_2024:.2f}</strong></p>',
+            unsafe_allow_html=True,
         )
-        tabela_completa = pd.merge(tabela_filtrada, os_por_dia, on="DATA FINALIZADO")
+        st.markdown("</div>", unsafe_allow_html=True)
 
-        col4, col5, col6 = st.columns([4, 3, 1])
+    st.write("---")
 
-        with col4:
-            st.subheader("Tabela de OS Finalizadas")
-            st.dataframe(tabela_completa)
 
-        junho_2024_finalizado = tabela[
-            (tabela["DATA FINALIZADO"].dt.month == 6) & (tabela["DATA FINALIZADO"].dt.year == 2024)
-        ]
+@fragmento
+def secao_orcamentos_por_mes(cubo):
+    dados_filtrados = fatiar(cubo, "orcado", "2023-01-01", "2025-12-31")
 
-        junho_2024_finalizado["DATA FINALIZADO"] = pd.to_datetime(
-            junho_2024_finalizado["DATA FINALIZADO"]
-        ).dt.strftime("%d/%m/%Y")
+    col1, col2, col3 = st.columns([1, 5, 1])
 
-        os_finalizado_por_dia = (
-            junho_2024_finalizado.groupby("DATA FINALIZADO")
-            .size()
-            .reset_index(name="QUANTIDADE")
+    with col1:
+        st.write("Filtro 1")
+        anos = [2023, 2024, 2025]
+        ano_selecionado = st.selectbox(
+            "Selecione o Ano", ["Todos"] + anos, key="ano1"
         )
 
-        media_execucao_por_dia = (
-            os_finalizado_por_dia.groupby("DATA FINALIZADO")["QUANTIDADE"]
-            .mean()
-            .reset_index(name="MEDIA_EXECUCAO")
+        meses = list(range(1, 13))
+        mes_inicial = st.selectbox(
+            "Mês Inicial", ["Todos"] + meses, 0, key="mes_inicial1"
+        )
+        mes_final = st.selectbox(
+            "Mês Final", ["Todos"] + meses, 11, key="mes_final1"
         )
 
-        media_geral_junho_2024 = media_execucao_por_dia["MEDIA_EXECUCAO"].mean()
-
-        with col5:
-            st.markdown(
-                '<p style="font-size: 20px; color: #f9f9f9;"><strong>Média de Execução por Dia em Junho de 2024</strong></p>',
-                unsafe_allow_html=True,
-            )
-            chart = (
-                alt.Chart(media_execucao_por_dia)
-                .mark_line(color="#1E90FF")
-                .encode(x="DATA FINALIZADO:T", y="MEDIA_EXECUCAO:Q")
-                .properties(width=600, height=400)
-            )
-            st.altair_chart(chart, use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True)
+    with col2:
+        if ano_selecionado != "Todos":
+            dados_selecionados = dados_filtrados.loc[
+                f"{ano_selecionado}-01-01":f"{ano_selecionado}-12-31"
+            ]
+        else:
+            dados_selecionados = dados_filtrados
 
-        with col6:
-            st.markdown(
-                '<p style="font-size: 18px; color: #f9f9f9;"><strong>Média Geral</strong></p>',
-                unsafe_allow_html=True,
+        if mes_inicial != "Todos" and mes_final != "Todos":
+            inicio_data = pd.Timestamp(
+                year=int(ano_selecionado) if ano_selecionado != "Todos" else 2023,
+                month=int(mes_inicial),
+                day=1,
             )
-            st.markdown(
-                f'<p style="font-size: 36px; color: #1E90FF;"><strong>{media_geral_junho_2024:.2f}</strong></p>',
-                unsafe_allow_html=True,
+            fim_data = pd.Timestamp(
+                year=int(ano_selecionado) if ano_selecionado != "Todos" else 2025,
+                month=int(mes_final),
+                day=calendar.monthrange(
+                    int(ano_selecionado) if ano_selecionado != "Todos" else 2025,
+                    int(mes_final),
+                )[1],
             )
-            st.markdown("</div>", unsafe_allow_html=True)
-
-        st.write("---")
+            dados_selecionados = dados_selecionados.loc[inicio_data:fim_data]
 
-        tabela["DATA ORÇADO"] = pd.to_datetime(
-            tabela["DATA ORÇADO"], dayfirst=True, errors="coerce"
+        st.markdown(
+            f'<p><strong>Quantidade de Orçamentos por Mês (<span style="color: #1E90FF;font-size: 18px">{mes_inicial}/{ano_selecionado} a {mes_final}/{ano_selecionado}</span>)</strong></p>',
+            unsafe_allow_html=True,
         )
-        dados_filtrados = tabela[tabela["DATA ORÇADO"].dt.year.isin([2023, 2024, 2025])]
-
-        col1, col2, col3 = st.columns([1, 5, 1])
-
-        with col1:
-            st.write("Filtro 1")
-            anos = [2023, 2024, 2025]
-            ano_selecionado = st.selectbox(
-                "Selecione o Ano", ["Todos"] + anos, key="ano1"
-            )
-
-            meses = list(range(1, 13))
-            mes_inicial = st.selectbox(
-                "Mês Inicial", ["Todos"] + meses, 0, key="mes_inicial1"
-            )
-            mes_final = st.selectbox(
-                "Mês Final", ["Todos"] + meses, 11, key="mes_final1"
+        with desempenho.medir("gráfico"):
+            graficos.exibir_serie(
+                por_mes(dados_selecionados),
+                "DATA ORÇADO",
+                "Quantidade",
+                minimo="M",
+                cor="#FF0000",
+                rotulo_x="MES",
             )
+        st.write("---")
 
-        with col2:
-            if ano_selecionado != "Todos":
-                dados_selecionados = dados_filtrados[
-                    dados_filtrados["DATA ORÇADO"].dt.year == ano_selecionado
-                ]
-            else:
-                dados_selecionados = dados_filtrados
-
-            if mes_inicial != "Todos" and mes_final != "Todos":
-                inicio_data = pd.Timestamp(
-                    year=int(ano_selecionado) if ano_selecionado != "Todos" else 2023,
-                    month=int(mes_inicial),
-                    day=1,
-                )
-                fim_data = pd.Timestamp(
-                    year=int(ano_selecionado) if ano_selecionado != "Todos" else 2025,
-                    month=int(mes_final),
-                    day=calendar.monthrange(
-                        int(ano_selecionado) if ano_selecionado != "Todos" else 2025,
-                        int(mes_final),
-                    )[1],
-                )
-                dados_selecionados = dados_selecionados[
-                    (dados_selecionados["DATA ORÇADO"] >= inicio_data)
-                    & (dados_selecionados["DATA ORÇADO"] <= fim_data)
+    with col3:
+        total_orcamentos_mes = contar(dados_selecionados)
+        total_orcamentos_ano = (
+            contar(
+                dados_filtrados.loc[
+                    f"{ano_selecionado}-01-01":f"{ano_selecionado}-12-31"
                 ]
-
-            orcamentos_por_mes = (
-                dados_selecionados.groupby(
-                    dados_selecionados["DATA ORÇADO"].dt.to_period("M")
-                )
-                .size()
-                .reset_index(name="Quantidade")
             )
+            if ano_selecionado != "Todos"
+            else contar(dados_filtrados)
+        )
 
-            st.markdown(
-                f'<p><strong>Quantidade de Orçamentos por Mês (<span style="color: #1E90FF;font-size: 18px">{mes_inicial}/{ano_selecionado} a {mes_final}/{ano_selecionado}</span>)</strong></p>',
-                unsafe_allow_html=True,
-            )
-            orcamentos_por_mes["MES"] = orcamentos_por_mes["DATA ORÇADO"].dt.strftime(
-                "%b %Y"
-            )
-            chart = (
-                alt.Chart(orcamentos_por_mes)
-                .mark_bar(color="#FF0000")
-                .encode(x="MES:T", y="Quantidade:Q")
-                .properties(width=600, height=400)
-            )
-            st.altair_chart(chart, use_container_width=True)
-            st.write("---")
-
-        with col3:
-            total_orcamentos_mes = dados_selecionados.shape[0]
-            total_orcamentos_ano = (
-                dados_filtrados[
-                    dados_filtrados["DATA ORÇADO"].dt.year == ano_selecionado
-                ].shape[0]
-                if ano_selecionado != "Todos"
-                else dados_filtrados.shape[0]
-            )
+        st.markdown(
+            f"""
+                <p style="font-size: 18px; color:#f9f9f9;"><strong>Total no Mês</strong></p>
+                <p style="font-size: 28px; color: #1E90FF;"><strong>{total_orcamentos_mes}</strong></p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+        st.markdown(
+            f"""
+                <p style="font-size: 18px; color: #f9f9f9;"><strong>Total no Ano</strong></p>
+                <p style="font-size: 28px; color: #1E90FF;"><strong>{total_orcamentos_ano}</strong></p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
 
-            st.markdown(
-                f"""
-                    <p style="font-size: 18px; color:#f9f9f9;"><strong>Total no Mês</strong></p>
-                    <p style="font-size: 28px; color: #1E90FF;"><strong>{total_orcamentos_mes}</strong></p>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                f"""
-                    <p style="font-size: 18px; color: #f9f9f9;"><strong>Total no Ano</strong></p>
-                    <p style="font-size: 28px; color: #1E90FF;"><strong>{total_orcamentos_ano}</strong></p>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
 
-        col6, col7 = st.columns([1, 4])
+@fragmento
+def secao_orcamentista(cubo):
+    col6, col7 = st.columns([1, 4])
 
-        with col6:
-            st.write("Filtro 3")
-            orcamentistas = tabela["ORÇAMENTISTA"].unique().tolist()
-            orcamentista_selecionado = st.selectbox(
-                "Selecione o Orçamentista",
-                ["Todos"] + orcamentistas,
-                key="orcamentista1",
-            )
+    with col6:
+        st.write("Filtro 3")
+        orcamentistas = cubo.opcoes["ORÇAMENTISTA"]
+        orcamentista_selecionado = st.selectbox(
+            "Selecione o Orçamentista",
+            ["Todos"] + orcamentistas,
+            key="orcamentista1",
+        )
 
-            data_inicial = st.date_input(
-                "Data Inicial", value=pd.to_datetime("2023-01-01"), key="data_inicial"
-            )
-            data_final = st.date_input(
-                "Data Final", value=pd.to_datetime("2024-12-31"), key="data_final"
-            )
+        data_inicial = st.date_input(
+            "Data Inicial", value=pd.to_datetime("2023-01-01"), key="data_inicial"
+        )
+        data_final = st.date_input(
+            "Data Final", value=pd.to_datetime("2024-12-31"), key="data_final"
+        )
 
-        with col7:
-            dados_selecionados_3 = tabela.copy()
+    with col7:
+        dados_selecionados_3 = fatiar(
+            cubo,
+            "orcado",
+            data_inicial,
+            data_final,
+            {"ORÇAMENTISTA": orcamentista_selecionado}
+            if orcamentista_selecionado != "Todos"
+            else None,
+        )
 
-            if orcamentista_selecionado != "Todos":
-                dados_selecionados_3 = dados_selecionados_3[
-                    dados_selecionados_3["ORÇAMENTISTA"] == orcamentista_selecionado
-                ]
+        st.subheader("Quantidade de Orçamentos por Orçamentista")
+        with desempenho.medir("gráfico"):
+            graficos.exibir_serie(
+                por_dia(dados_selecionados_3),
+                "DATA ORÇADO",
+                "Quantidade",
+                cor="#1E90FF",
+                rotulo_x="DATA",
+            )
 
-            dados_selecionados_3 = dados_selecionados_3[
-                (dados_selecionados_3["DATA ORÇADO"] >= pd.to_datetime(data_inicial))
-                & (dados_selecionados_3["DATA ORÇADO"] <= pd.to_datetime(data_final))
-            ]
+    col8, col9, col10 = st.columns(3)
 
-            orcamentos_por_dia = (
-                dados_selecionados_3.groupby(
-                    dados_selecionados_3["DATA ORÇADO"].dt.to_period("D")
-                )
-                .size()
-                .reset_index(name="Quantidade")
-            )
-            orcamentos_por_dia["DATA"] = orcamentos_por_dia["DATA ORÇADO"].dt.strftime(
-                "%d/%m/%Y"
-            )
+    with col8:
+        total_orcamentos_mes_orcamentista = contar(dados_selecionados_3)
+        st.markdown(
+            f"""
+                <p style="font-size: 18px; color: #f9f9f9;"><strong>Total no Mês</strong></p>
+                <p style="font-size: 24px; color: #1E90FF;"><strong>{total_orcamentos_mes_orcamentista}</strong></p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+    with col9:
+        total_orcamentos_dia_orcamentista = contar(dados_selecionados_3)
+        st.markdown(
+            f"""
+                <p style="font-size: 18px; color: #f9f9f9;"><strong>Total no Dia</strong></p>
+                <p style="font-size: 24px; color: #1E90FF;"><strong>{total_orcamentos_dia_orcamentista}</strong></p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+    st.write("-----")
 
-            st.subheader("Quantidade de Orçamentos por Orçamentista")
-            chart_3 = (
-                alt.Chart(orcamentos_por_dia)
-                .mark_bar(color="#1E90FF")
-                .encode(x="DATA:T", y="Quantidade:Q")
-                .properties(width=600, height=400)
-            )
-            st.altair_chart(chart_3, use_container_width=True)
 
-        col8, col9, col10 = st.columns(3)
+def gerar_contrato():
+    st.write("---")
 
-        with col8:
-            total_orcamentos_mes_orcamentista = orcamentos_por_dia["Quantidade"].sum()
-            st.markdown(
-                f"""
-                    <p style="font-size: 18px; color: #f9f9f9;"><strong>Total no Mês</strong></p>
-                    <p style="font-size: 24px; color: #1E90FF;"><strong>{total_orcamentos_mes_orcamentista}</strong></p>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-        with col9:
-            total_orcamentos_dia_orcamentista = orcamentos_por_dia["Quantidade"].sum()
-            st.markdown(
-                f"""
-                    <p style="font-size: 18px; color: #f9f9f9;"><strong>Total no Dia</strong></p>
-                    <p style="font-size: 24px; color: #1E90FF;"><strong>{total_orcamentos_dia_orcamentista}</strong></p>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-        st.write("-----")
+    try:
+        snapshot = carregar_os()
+        # Gráficos e totais da página são recortes do cubo diário, montado uma vez por snapshot
+        cubo = snapshot.derivar(montar_cubo)
+        finalizadas_os = snapshot.derivar(tabela_finalizadas)
+        vazao_os = snapshot.derivar(montar_vazao)
     except pd.errors.EmptyDataError:
         st.error("O arquivo CSV está vazio.")
+        return
     except pd.errors.ParserError:
         st.error("Erro ao analisar o arquivo CSV.")
+        return
     except Exception as e:
         st.error(f"Ocorreu um erro ao carregar o arquivo CSV: {e}")
+        return
+
+    secao_totais(cubo)
+    secao_os_por_mes(cubo)
+    secao_os_por_dia(cubo)
+    secao_os_por_disciplina(cubo)
+    secao_os_por_status(cubo)
+    secao_resultados(cubo)
+    secao_finalizadas_junho(cubo, vazao_os)
+    secao_finalizadas(cubo, finalizadas_os, vazao_os)
+    secao_orcamentos_por_mes(cubo)
+    secao_orcamentista(cubo)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+
+import altair as alt
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+# Pontos por série acima dos quais o gráfico passa ao grão seguinte
+MAXIMO_PONTOS = int(os.environ.get("GENPAC_GRAFICO_PONTOS", "400"))
+# Especificações prontas guardadas no processo, das usadas mais recentemente
+MAXIMO_ESPECIFICACOES = 128
+# Coluna com o fim de cada período; as barras cobrem o período inteiro
+FIM = "ATÉ"
+
+# Do mais fino ao mais grosso: período do pandas -> (rótulo, formato do eixo)
+GRAOS = {
+    "D": ("dia", "%d/%m/%Y"),
+    "W": ("semana", "%d/%m/%Y"),
+    "M": ("mês", "%b %Y"),
+    "Q": ("trimestre", "T%q %Y"),
+    "Y": ("ano", "%Y"),
+}
+
+# assinatura -> especificação Vega-Lite com os dados já em Arrow, compartilhado pelo processo
+_especificacoes = OrderedDict()
+_trava = threading.Lock()
+
+
+def escolher_grao(inicio, fim, minimo="D", maximo=MAXIMO_PONTOS):
+    # O grão mais fino, a partir de `minimo`, em que o período cabe em `maximo` pontos
+    graos = list(GRAOS)
+    for grao in graos[graos.index(minimo):]:
+        if (fim.to_period(grao) - inicio.to_period(grao)).n + 1 <= maximo:
+            return grao
+    return graos[-1]
+
+
+def agregar(serie, agregacao="sum", minimo="D", maximo=MAXIMO_PONTOS):
+    # Série indexada por data ou período -> (série indexada pelos períodos do grão, grão)
+    indice = serie.index
+    if isinstance(indice, pd.PeriodIndex):
+        indice = indice.to_timestamp()
+    indice = pd.DatetimeIndex(indice)
+    if serie.empty:
+        return pd.Series(serie.to_numpy(), index=indice.to_period(minimo)), minimo
+    grao = escolher_grao(indice.min(), indice.max(), minimo, maximo)
+    agregada = pd.Series(serie.to_numpy()).groupby(indice.to_period(grao).to_numpy())
+    return agregada.agg(agregacao), grao
+
+
+def _assinatura(dados, *parametros):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pd.util.hash_pandas_object(dados, index=False).to_numpy().tobytes())
+    h.update(repr((list(dados.columns), list(map(str, dados.dtypes)), parametros)).encode())
+    return h.hexdigest()
+
+
+def _serializar(dados):
+    tabela = pa.Table.from_pandas(dados)
+    saida = pa.BufferOutputStream()
+    with pa.ipc.new_stream(saida, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    return saida.getvalue().to_pybytes()
+
+
+def _montar(nome, dados, x, y, marca, cor, titulo, rotulo_x, formato, largura, altura):
+    estilo = {"color": cor} if cor else {}
+    grafico = getattr(alt.Chart(alt.NamedData(name=nome)), f"mark_{marca}")(**estilo)
+    codificacao = {
+        "x": alt.X(f"{x}:T", title=rotulo_x or x, axis=alt.Axis(format=formato)),
+        "y": alt.Y(f"{y}:Q"),
+        "tooltip": [alt.Tooltip(f"{x}:T", format=formato), alt.Tooltip(f"{y}:Q")],
+    }
+    if marca == "bar":
+        codificacao["x2"] = alt.X2(f"{FIM}:T")
+    grafico = grafico.encode(**codificacao).properties(width=largura, height=altura)
+    if titulo:
+        grafico = grafico.properties(title=titulo)
+    # Mesmo tema que o st.altair_chart usa ao converter um gráfico Altair
+    with alt.themes.enable("none") if alt.themes.active == "default" else nullcontext():
+        especificacao = grafico.to_dict()
+    especificacao["datasets"] = {nome: _serializar(dados)}
+    return especificacao
+
+
+def especificar(
+    serie,
+    x,
+    y,
+    marca="bar",
+    cor=None,
+    titulo=None,
+    rotulo_x=None,
+    agregacao="sum",
+    minimo="D",
+    largura=600,
+    altura=400,
+):
+    # Série temporal -> (especificação Vega-Lite com no máximo MAXIMO_PONTOS pontos, grão).
+    # A mesma série com os mesmos parâmetros reaproveita a especificação e o Arrow já prontos
+    serie, grao = agregar(serie, agregacao, minimo)
+    periodos = pd.PeriodIndex(serie.index, freq=grao)
+    dados = pd.DataFrame(
+        {x: periodos.start_time, FIM: (periodos + 1).start_time, y: serie.to_numpy()}
+    )
+    parametros = (x, y, marca, cor, titulo, rotulo_x, grao, largura, altura)
+    assinatura = _assinatura(dados, *parametros)
+    with _trava:
+        especificacao = _especificacoes.get(assinatura)
+        if especificacao is not None:
+            _especificacoes.move_to_end(assinatura)
+            return especificacao, grao
+    especificacao = _montar(
+        _assinatura(dados), dados, x, y, marca, cor, titulo, rotulo_x, GRAOS[grao][1],
+        largura, altura,
+    )
+    with _trava:
+        _especificacoes[assinatura] = especificacao
+        while len(_especificacoes) > MAXIMO_ESPECIFICACOES:
+            _especificacoes.popitem(last=False)
+    return especificacao, grao
+
+
+def exibir_serie(serie, x, y, minimo="D", container=st, **opcoes):
+    # Mostra a série no grão escolhido e avisa quando ela foi agrupada
+    especificacao, grao = especificar(serie, x, y, minimo=minimo, **opcoes)
+    container.vega_lite_chart(especificacao, use_container_width=True)
+    if grao != minimo:
+        container.caption(f"Valores agrupados por {GRAOS[grao][0]} no período selecionado.")
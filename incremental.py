@@ -0,0 +1,160 @@
+import io
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Acima desta proporção de linhas novas ou alteradas a carga completa sai mais barata
+PROPORCAO_MAXIMA = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Indice:
+    # Assinatura de cada linha do CSV bruto, na ordem das linhas da tabela,
+    # e os tipos que o pandas inferiu na leitura completa
+    cabecalho: bytes
+    chaves: pd.Index
+    tipos: dict
+
+
+@dataclass(frozen=True)
+class Delta:
+    # Linhas que saíram e que entraram em relação à versão `base`, já tipadas
+    base: str
+    removidas: pd.DataFrame
+    adicionadas: pd.DataFrame
+
+
+def _linhas(conteudo):
+    linhas = conteudo.split(b"\n")
+    if linhas[-1].strip() == b"":
+        linhas.pop()
+    corpo = np.empty(len(linhas) - 1, dtype=object)
+    corpo[:] = linhas[1:]
+    return linhas[0], corpo
+
+
+def _chaves(linhas):
+    # A partir da segunda vez que uma linha idêntica aparece, o número da
+    # ocorrência entra na assinatura; a primeira fica com a assinatura da linha
+    assinaturas = pd.util.hash_array(linhas, categorize=False)
+    repetidas = pd.Series(assinaturas).duplicated().to_numpy()
+    if repetidas.any():
+        ocorrencia = pd.Series(assinaturas).groupby(assinaturas).cumcount().to_numpy()
+        assinaturas[repetidas] = pd.util.hash_pandas_object(
+            pd.DataFrame(
+                {"linha": assinaturas[repetidas], "ocorrencia": ocorrencia[repetidas]}
+            ),
+            index=False,
+        ).to_numpy()
+    return pd.Index(assinaturas)
+
+
+def indexar(conteudo, bruta):
+    # Só indexa quando cada linha do arquivo é uma linha da tabela: células com
+    # quebra de linha ou linhas em branco deixam a planilha na carga completa
+    cabecalho, linhas = _linhas(conteudo)
+    if len(linhas) != len(bruta):
+        return None
+    chaves = _chaves(linhas)
+    if not chaves.is_unique:
+        return None
+    return Indice(cabecalho=cabecalho, chaves=chaves, tipos=dict(bruta.dtypes))
+
+
+def _alinhar(mantidas, novas):
+    # As linhas novas passam a ter os tipos da tabela anterior; categorias novas
+    # entram em ordem, como numa conversão da tabela inteira
+    for coluna in mantidas.columns:
+        tipo = mantidas[coluna].dtype
+        if isinstance(tipo, pd.CategoricalDtype):
+            valores = novas[coluna].astype(object)
+            extras = pd.Index(valores.dropna().unique()).difference(tipo.categories)
+            if len(extras):
+                categorias = tipo.categories.append(extras).sort_values()
+                mantidas[coluna] = mantidas[coluna].cat.set_categories(categorias)
+                tipo = mantidas[coluna].dtype
+            novas[coluna] = pd.Categorical(valores, dtype=tipo)
+        elif novas[coluna].dtype != tipo:
+            novas[coluna] = novas[coluna].astype(tipo)
+    return mantidas, novas
+
+
+def aplicar(conteudo, anterior, tipar, chave):
+    # Devolve (tabela, rejeitados, indice, delta), ou None quando a carga
+    # completa é necessária
+    indice = anterior.indice
+    if indice is None:
+        return None
+    cabecalho, linhas = _linhas(conteudo)
+    if cabecalho != indice.cabecalho:
+        return None
+    chaves = _chaves(linhas)
+    if not chaves.is_unique:
+        return None
+
+    posicoes = indice.chaves.get_indexer(chaves)
+    mudadas = posicoes < 0
+    if mudadas.sum() > PROPORCAO_MAXIMA * len(linhas):
+        return None
+
+    try:
+        bruta = pd.read_csv(
+            io.BytesIO(b"\n".join([cabecalho, *linhas[mudadas]])), dtype=indice.tipos
+        )
+    except (ValueError, pd.errors.ParserError):
+        # Um valor que muda o tipo inferido da coluna pede a leitura completa
+        return None
+    if len(bruta) != mudadas.sum() or list(bruta.columns) != list(indice.tipos):
+        return None
+    novas, rejeitados_novos = tipar(bruta)
+
+    mantidas_antes = posicoes[~mudadas]
+    saem = np.ones(len(indice.chaves), dtype=bool)
+    saem[mantidas_antes] = False
+    removidas = anterior.tabela.take(np.flatnonzero(saem))
+    mantidas, novas = _alinhar(anterior.tabela.take(mantidas_antes), novas)
+
+    # Cada linha volta à posição que ocupa no arquivo novo
+    origem = np.concatenate([np.flatnonzero(~mudadas), np.flatnonzero(mudadas)])
+    ordem = np.empty(len(origem), dtype=np.intp)
+    ordem[origem] = np.arange(len(origem))
+    tabela = pd.concat([mantidas, novas], ignore_index=True).take(ordem)
+    tabela = tabela.reset_index(drop=True)
+    for coluna in tabela.columns:
+        if isinstance(tabela[coluna].dtype, pd.CategoricalDtype):
+            tabela[coluna] = tabela[coluna].cat.remove_unused_categories()
+
+    # Rejeições das linhas mantidas seguem a linha; as das novas vêm da limpeza
+    partes = [
+        rejeitados_novos.assign(
+            linha=np.flatnonzero(mudadas)[rejeitados_novos["linha"].to_numpy(dtype=np.intp)]
+        )
+    ]
+    if anterior.rejeitados is not None and len(anterior.rejeitados):
+        nova_posicao = np.full(len(indice.chaves), -1, dtype=np.intp)
+        nova_posicao[mantidas_antes] = np.flatnonzero(~mudadas)
+        antigos = anterior.rejeitados.assign(
+            linha=nova_posicao[anterior.rejeitados["linha"].to_numpy(dtype=np.intp)]
+        )
+        partes.insert(0, antigos[antigos["linha"] >= 0])
+    partes = [parte for parte in partes if len(parte)] or [rejeitados_novos]
+    rejeitados = pd.concat(partes, ignore_index=True)
+
+    if chave in novas.columns:
+        saiu = removidas[chave].dropna()
+        entrou = novas[chave].dropna()
+        alteradas = entrou.isin(saiu).sum()
+        logger.info(
+            "Carga incremental: %d linhas novas, %d alteradas, %d removidas",
+            len(entrou) - alteradas,
+            alteradas,
+            len(saiu) - alteradas,
+        )
+
+    indice = Indice(cabecalho=cabecalho, chaves=chaves, tipos=indice.tipos)
+    delta = Delta(base=anterior.versao, removidas=removidas, adicionadas=novas)
+    return tabela, rejeitados, indice, delta
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from contratos import IDS
+
+# Indicadores do Relatório Diário, sem Streamlit: usados pela página, pelo PDF
+# do dia e pela exportação
+
+
+def montar_metricas(tabela, hoje):
+    hoje = pd.Timestamp(hoje)
+    indicadores = pd.DataFrame(
+        {
+            "CONTRATO": tabela["CONTRATO"],
+            "total_os_hoje": tabela["DATA RECEBIDO"] == hoje,
+            "total_os_julho": (tabela["MES RECEBIDO"] == 7) & (tabela["ANO RECEBIDO"] == 2024),
+            "total_orcamentos_hoje": tabela["DATA ORÇADO"] == hoje,
+            "total_executadas_hoje": tabela["DATA FINALIZADO"] == hoje,
+        }
+    )
+    # Uma linha por contrato do registro, mesmo sem OS no dia
+    return (
+        indicadores.groupby("CONTRATO", observed=True)
+        .sum()
+        .reindex(IDS, fill_value=0)
+        .astype(int)
+    )
+
+
+def calcular_metricas(metricas, contrato):
+    if contrato not in metricas.index:
+        return dict.fromkeys(metricas.columns, 0)
+    return metricas.loc[contrato].to_dict()
+
+
+def contar_ocorrencias(tabela):
+    return (
+        tabela.groupby(["CONTRATO", "DISCIPLINAS", "STATUS*"], observed=True)
+        .size()
+        .reset_index(name="QUANTIDADE")
+    )
+
+
+def contar_disciplinas_finalizadas(tabela, hoje):
+    os_finalizadas_hoje = tabela[tabela["DATA FINALIZADO"] == pd.Timestamp(hoje)]
+    total_disciplina_finalizadas_hoje = (
+        os_finalizadas_hoje["DISCIPLINAS"].value_counts().loc[lambda c: c > 0].reset_index()
+    )
+    total_disciplina_finalizadas_hoje.columns = ["Disciplina", "Quantidade"]
+    return total_disciplina_finalizadas_hoje
@@ -0,0 +1,125 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Regras de conversão de células em reais (formato brasileiro):
+#   "R$ 1.234,56", "1234,56", "1.234"      -> 1234.56, 1234.56, 1234.0
+#   "-R$ 10,00", "R$ -10,00", "(R$ 10,00)" -> -10.0
+#   "R$ -", "-"                             -> 0.0 (zero no formato contábil)
+#   vazio ou ausente                        -> NaN, sem rejeição
+#   qualquer outra coisa                    -> NaN e entra no relatório de rejeitadas
+_ESPACO = r"[\s\x{00A0}]*"
+_NUMERO = r"(\d{1,3}(\.\d{3})+|\d+)(,\d+)?"
+_VALIDO = (
+    rf"^{_ESPACO}(-{_ESPACO}(R\$)?|(R\$)?{_ESPACO}-?){_ESPACO}{_NUMERO}{_ESPACO}$"
+    rf"|^{_ESPACO}\({_ESPACO}(R\$)?{_ESPACO}{_NUMERO}{_ESPACO}\){_ESPACO}$"
+)
+_ZERO = rf"^{_ESPACO}(R\$)?{_ESPACO}-{_ESPACO}$"
+
+logger = logging.getLogger(__name__)
+
+
+def _para_arrow(valores):
+    # Colunas de texto Arrow (string[pyarrow], infer_string) chegam como
+    # large_string; o cast garante os offsets de 32 bits lidos em _somente_numeros
+    try:
+        texto = pa.array(valores, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        texto = pa.array(valores.astype("string"), type=pa.string())
+    return texto.cast(pa.string())
+
+
+def _somente_numeros(texto):
+    # Mantém só dígitos e a vírgula decimal, direto nos bytes do array Arrow
+    n = len(texto)
+    offsets = np.frombuffer(texto.buffers()[1], dtype=np.int32)[texto.offset:texto.offset + n + 1]
+    dados = texto.buffers()[2]
+    if dados is None:
+        dados = np.zeros(0, dtype=np.uint8)
+    else:
+        dados = np.frombuffer(dados, dtype=np.uint8)[offsets[0]:offsets[-1]]
+
+    manter = ((dados - 48) < 10) | (dados == 44)
+    acumulado = np.zeros(len(dados) + 1, dtype=np.int32)
+    np.cumsum(manter.view(np.uint8), out=acumulado[1:], dtype=np.int32)
+    compactos = dados[manter]
+    compactos[compactos == 44] = 46
+    return pa.StringArray.from_buffers(
+        n, pa.py_buffer(acumulado[offsets - offsets[0]]), pa.py_buffer(compactos)
+    )
+
+
+def _converter_texto(texto):
+    vazio = pc.fill_null(pc.equal(pc.utf8_trim_whitespace(texto), ""), True)
+    valido = pc.fill_null(pc.match_substring_regex(texto, _VALIDO), False)
+
+    numeros = pc.cast(pc.if_else(valido, _somente_numeros(texto), None), pa.float64())
+    negativo = pc.or_(pc.match_substring(texto, "-"), pc.match_substring(texto, "("))
+    numeros = pc.if_else(negativo, pc.negate(numeros), numeros).to_numpy(
+        zero_copy_only=False, writable=True
+    )
+
+    vazio = vazio.to_numpy(zero_copy_only=False)
+    valido = valido.to_numpy(zero_copy_only=False)
+    zero = np.zeros(len(texto), dtype=bool)
+    suspeitos = np.flatnonzero(~valido & ~vazio)
+    if len(suspeitos):
+        zero[suspeitos] = pc.match_substring_regex(
+            texto.take(pa.array(suspeitos)), _ZERO
+        ).to_numpy(zero_copy_only=False)
+    numeros[zero] = 0.0
+    return numeros, ~(vazio | valido | zero)
+
+
+def converter_moeda(valores):
+    if pd.api.types.is_numeric_dtype(valores):
+        return valores.astype("float64"), pd.Series(False, index=valores.index)
+    numeros, rejeitados = _converter_texto(_para_arrow(valores))
+    return (
+        pd.Series(numeros, index=valores.index, name=valores.name),
+        pd.Series(rejeitados, index=valores.index, name=valores.name),
+    )
+
+
+def converter_colunas(tabela, colunas):
+    colunas = [c for c in colunas if c in tabela.columns]
+    textuais = [c for c in colunas if not pd.api.types.is_numeric_dtype(tabela[c])]
+    for coluna in colunas:
+        if coluna not in textuais:
+            tabela[coluna] = tabela[coluna].astype("float64")
+
+    rejeitados = pd.DataFrame(columns=["coluna", "linha", "valor"])
+    if not textuais:
+        return tabela, rejeitados
+
+    # Todas as colunas de moeda são convertidas numa única passada
+    texto = pa.concat_arrays([_para_arrow(tabela[c]) for c in textuais])
+    numeros, mascara = _converter_texto(texto)
+
+    partes = []
+    n = len(tabela)
+    for i, coluna in enumerate(textuais):
+        fatia = slice(i * n, (i + 1) * n)
+        mascara_coluna = mascara[fatia]
+        if mascara_coluna.any():
+            partes.append(
+                pd.DataFrame(
+                    {
+                        "coluna": coluna,
+                        "linha": tabela.index[mascara_coluna],
+                        "valor": tabela[coluna].to_numpy()[mascara_coluna],
+                    }
+                )
+            )
+        tabela[coluna] = numeros[fatia]
+
+    if partes:
+        rejeitados = pd.concat(partes, ignore_index=True)
+        logger.warning(
+            "Células de moeda rejeitadas: %s",
+            rejeitados["coluna"].value_counts().to_dict(),
+        )
+    return tabela, rejeitados
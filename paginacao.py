@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+TAMANHOS_PAGINA = [50, 100, 250]
+ORDEM_PLANILHA = "Ordem da planilha"
+
+
+def _contem(tabela, texto):
+    # Busca sem diferenciar caixa; nas colunas categóricas só as categorias são percorridas
+    mascara = np.zeros(len(tabela), dtype=bool)
+    for coluna in tabela.columns:
+        serie = tabela[coluna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            categorias = serie.cat.categories
+            achadas = categorias.astype(str).str.contains(texto, case=False, regex=False)
+            mascara |= serie.isin(categorias[achadas]).to_numpy()
+        elif pd.api.types.is_string_dtype(serie.dtype):
+            achadas = serie.str.contains(texto, case=False, regex=False)
+            mascara |= achadas.fillna(False).to_numpy(dtype=bool)
+    return mascara
+
+
+def exibir_paginada(tabela, chave):
+    # Busca, ordenação e paginação acontecem aqui; o navegador recebe só a página visível
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        busca = st.text_input("Buscar", key=f"{chave}_busca")
+    with col2:
+        ordem = st.selectbox(
+            "Ordenar por", [ORDEM_PLANILHA] + list(tabela.columns), key=f"{chave}_ordem"
+        )
+    with col3:
+        decrescente = st.toggle("Decrescente", key=f"{chave}_decrescente")
+    with col4:
+        tamanho = st.selectbox("Linhas por página", TAMANHOS_PAGINA, key=f"{chave}_tamanho")
+
+    if busca:
+        tabela = tabela[_contem(tabela, busca)]
+    if ordem != ORDEM_PLANILHA:
+        tabela = tabela.sort_values(ordem, ascending=not decrescente, kind="stable")
+    elif decrescente:
+        tabela = tabela.iloc[::-1]
+
+    # Mudar a busca, a ordem ou o tamanho da página volta para a primeira página
+    paginas = max(1, math.ceil(len(tabela) / tamanho))
+    pagina = st.number_input(
+        "Página", 1, paginas, 1, key=f"{chave}_pagina_{(busca, ordem, decrescente, tamanho)}"
+    )
+    inicio = (pagina - 1) * tamanho
+    st.dataframe(tabela.iloc[inicio:inicio + tamanho])
+    st.caption(f"Página {pagina} de {paginas} · {len(tabela):,} linhas".replace(",", "."))
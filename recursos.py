@@ -0,0 +1,78 @@
+import base64
+import os
+import re
+import threading
+import time
+
+import streamlit as st
+
+# Intervalo mínimo, em segundos, entre duas consultas ao mtime do mesmo arquivo
+INTERVALO_VERIFICACAO = float(os.environ.get("GENPAC_RECURSOS_VERIFICACAO", "5"))
+
+# (tipo, caminho) -> (mtime, verificado_em, conteúdo), compartilhado pelo processo
+_cache = {}
+_contagem = {"acertos": 0, "leituras": 0}
+_trava = threading.Lock()
+
+
+def minificar_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def _ler_css(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return minificar_css(arquivo.read())
+
+
+def _ler_bytes(caminho):
+    with open(caminho, "rb") as arquivo:
+        return arquivo.read()
+
+
+def _ler_base64(caminho):
+    return base64.b64encode(imagem(caminho)).decode()
+
+
+def _obter(tipo, caminho, ler):
+    agora = time.monotonic()
+    chave = (tipo, caminho)
+    with _trava:
+        item = _cache.get(chave)
+        if item is not None and agora - item[1] < INTERVALO_VERIFICACAO:
+            _contagem["acertos"] += 1
+            return item[2]
+
+    mtime = os.stat(caminho).st_mtime_ns
+    if item is not None and item[0] == mtime:
+        conteudo, resultado = item[2], "acertos"
+    else:
+        conteudo, resultado = ler(caminho), "leituras"
+
+    with _trava:
+        _cache[chave] = (mtime, agora, conteudo)
+        _contagem[resultado] += 1
+    return conteudo
+
+
+def css(caminho):
+    return _obter("css", caminho, _ler_css)
+
+
+def imagem(caminho):
+    return _obter("bytes", caminho, _ler_bytes)
+
+
+def imagem_base64(caminho):
+    return _obter("base64", caminho, _ler_base64)
+
+
+def aplicar_css(caminho):
+    st.markdown(f"<style>{css(caminho)}</style>", unsafe_allow_html=True)
+
+
+def estatisticas():
+    with _trava:
+        return {**_contagem, "arquivos": len(_cache)}
@@ -0,0 +1,141 @@
+from datetime import datetime
+
+from fpdf import FPDF
+
+from contratos import CONTRATOS, IDS, resultados, rotulos
+from indicadores import contar_disciplinas_finalizadas, contar_ocorrencias, montar_metricas
+from Valor_contrato import calculate_metrics, summarize_budgets
+
+# Colunas e períodos do resumo dos contratos, com os rótulos da página Orçamentos
+VALORES = {
+    "VALOR ORÇADO": "Orçado",
+    "VALOR INSUMO": "Insumo",
+    "VALOR MÃO DE OBRA": "Mão de Obra",
+}
+PERIODOS = {
+    "today": "Hoje",
+    "july_2024": "Julho 2024",
+    "total": "Total",
+    "previa_july_2024": "Prévia de Medição Julho 2024",
+}
+
+
+# Caracteres comuns fora do Latin-1, a única codificação das fontes do fpdf 1.7
+SUBSTITUICOES = str.maketrans(
+    {"–": "-", "—": "-", "“": '"', "”": '"', "‘": "'", "’": "'", "…": "...", "•": "-"}
+)
+
+
+def latin1(texto):
+    # O que ainda não couber no Latin-1 vira "?", em vez de derrubar o PDF
+    return str(texto).translate(SUBSTITUICOES).encode("latin-1", "replace").decode("latin-1")
+
+
+class _Relatorio(FPDF):
+    def cell(self, w, h=0, txt="", *args, **kwargs):
+        return super().cell(w, h, latin1(txt), *args, **kwargs)
+
+    def titulo(self, texto):
+        self.set_font("Arial", "B", 13)
+        self.ln(4)
+        self.cell(0, 8, texto, ln=1)
+
+    def tabela(self, cabecalho, linhas, larguras):
+        self.set_font("Arial", "B", 9)
+        self.set_fill_color(128, 0, 0)
+        self.set_text_color(255, 255, 255)
+        for texto, largura in zip(cabecalho, larguras):
+            self.cell(largura, 7, texto, border=1, fill=True, align="C")
+        self.ln()
+        self.set_font("Arial", "", 9)
+        self.set_text_color(0, 0, 0)
+        for linha in linhas:
+            for i, (texto, largura) in enumerate(zip(linha, larguras)):
+                self.cell(largura, 6, str(texto), border=1, align="L" if i == 0 else "R")
+            self.ln()
+
+
+def gerar_pdf(tabela, hoje):
+    # O Relatório Diário e o resumo dos contratos do dia `hoje`, em bytes de PDF
+    pdf = _Relatorio(orientation="P", unit="mm", format="A4")
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, "Relatório Banrisul - Relatório Diário", ln=1, align="C")
+    pdf.set_font("Arial", "", 10)
+    pdf.cell(
+        0,
+        6,
+        f"Dia {hoje:%d/%m/%Y} - gerado em {datetime.now():%d/%m/%Y %H:%M}",
+        ln=1,
+        align="C",
+    )
+
+    siglas = {contrato.id: contrato.sigla for contrato in CONTRATOS}
+    pdf.titulo(f"Resultados {rotulos()}")
+    pdf.tabela(
+        ["Lote", "Abertas", "Finalizadas", "Percentual"],
+        [
+            [
+                f"{linha.Index[1]} {siglas[linha.Index[0]]}",
+                linha.abertas,
+                linha.finalizadas,
+                f"{linha.percentual:.2f}%",
+            ]
+            for linha in resultados(contar_ocorrencias(tabela)).itertuples()
+        ],
+        [70, 40, 40, 40],
+    )
+
+    metricas = montar_metricas(tabela, hoje)
+    indicadores = {
+        "total_os_hoje": "OS Recebidas Hoje",
+        "total_os_julho": "OS Julho",
+        "total_orcamentos_hoje": "Orçamentos Hoje",
+        "total_executadas_hoje": "OS Finalizadas Hoje",
+    }
+    pdf.titulo(f"Métricas {rotulos()}")
+    pdf.tabela(
+        ["Indicador", *(contrato.rotulo for contrato in CONTRATOS), "Total"],
+        [
+            [rotulo, *metricas[chave], metricas[chave].sum()]
+            for chave, rotulo in indicadores.items()
+        ],
+        [70] + [120 // len(CONTRATOS)] * len(CONTRATOS) + [40],
+    )
+
+    disciplinas = contar_disciplinas_finalizadas(tabela, hoje)
+    pdf.titulo("Total de Disciplinas Finalizadas Hoje")
+    if len(disciplinas):
+        pdf.tabela(
+            ["Disciplina", "Quantidade"],
+            zip(disciplinas["Disciplina"], disciplinas["Quantidade"]),
+            [110, 40],
+        )
+    else:
+        pdf.set_font("Arial", "", 10)
+        pdf.cell(0, 6, "Nenhuma OS finalizada no dia.", ln=1)
+
+    resumo = calculate_metrics(summarize_budgets(tabela), hoje)
+    pdf.titulo("Resumo dos Contratos")
+    pdf.tabela(
+        ["Período e valor", *(f"Contrato {contrato}" for contrato in IDS)],
+        [
+            [
+                f"{periodo} - {rotulo}",
+                *(f"R$ {resumo.loc[contrato, (chave, coluna)]:,.2f}" for contrato in IDS),
+            ]
+            for chave, periodo in PERIODOS.items()
+            for coluna, rotulo in VALORES.items()
+        ],
+        [90] + [100 // len(IDS)] * len(IDS),
+    )
+
+    # O fpdf 1.7 devolve o documento como texto latin-1
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def preparar(snapshot):
+    # Chamado pelo atualizador a cada ciclo: o PDF do dia fica pronto uma vez
+    # por versão dos dados, antes de alguém pedir o download
+    return snapshot.derivar(gerar_pdf, datetime.now().date())
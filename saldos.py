@@ -1,79 +1,59 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
-from datetime import datetime
-import base64
-
-def convert_currency(value):
-    if isinstance(value, str):
-        return float(
-            value.replace("R$", "")
-            .replace(".", "")
-            .replace(",", ".")
-            .strip()
-        )
-    return value
-
-@st.cache_data(ttl=60)
-def load_data(csv_url):
-    df = pd.read_csv(csv_url)
-    df = df[
-        ~df["VALOR"].astype(str).str.contains("nan|http")
-    ].copy()
-    df["VALOR"] = df["VALOR"].apply(convert_currency)
-    df["SALDO L1"] = df["SALDO L1"].apply(convert_currency)
-    df["SALDO L2"] = df["SALDO L2"].apply(convert_currency)
-
-    df["MES_ANO"] = df["MES"].astype(str) + '/' + df["ANO"].astype(str)
-    return df
-
-def main():
-    csv_url = (
-        "https://docs.google.com/spreadsheets/d/e/2PACX-1vSlTQoxa_YIMgRHv5x-"
-        "URXirElC2efKea8CKK4U2qhqIKJPg_Zgv6IKZFVRCMNhYlohC0la69ueAyL_/"
-        "pub?gid=713266789&single=true&output=csv"
+import cartoes
+import desempenho
+import graficos
+import recursos
+from contratos import CONTRATOS, IDS
+from dados import carregar_saldos
+
+def summarize_balances(df):
+    # Uma linha por contrato do registro, de uma passada agrupada por LOTE e STATUS,
+    # e os indicadores gerais da planilha
+    paid = (df["STATUS"] == "PAGO").rename("PAGO")
+    values = (
+        df.groupby([df["LOTE"], paid], observed=True)["VALOR"]
+        .sum()
+        .unstack("PAGO")
+        .reindex(index=[contract.lote for contract in CONTRATOS], columns=[True, False])
+        .fillna(0)
+    )
+    saldos = df[[contract.coluna_saldo for contract in CONTRATOS]].agg(["mean", "sum"])
+    lots = pd.DataFrame(
+        {
+            "total_paid": values[True].to_numpy(),
+            "pending_payments": values[False].to_numpy(),
+            "mean_saldo": saldos.loc["mean"].to_numpy(),
+            "total_saldo": saldos.loc["sum"].to_numpy(),
+        },
+        index=pd.Index(IDS, name="CONTRATO"),
     )
+    # Cada contrato comparado ao primeiro do registro; o primeiro fica com zero
+    lots["saldo_difference"] = lots["total_saldo"].iloc[0] - lots["total_saldo"]
+    summary = {
+        "avg_invoice_value": df["VALOR"].mean(),
+        "total_invoices": df["NOTA FISCAL"].count(),
+        "total_mes": lots["pending_payments"].sum(),
+    }
+    return lots, summary
 
+def main():
     with st.spinner("Carregando dados..."):
-        df = load_data(csv_url)
-
-    summary_stats = df[["VALOR", "SALDO L1", "SALDO L2"]].describe()
-
-    monthly_totals = df.groupby("MES_ANO")["VALOR"].sum().reset_index()
-
-    total_paid_lote1 = df[
-        (df["LOTE"] == "LOTE 01") & (df["STATUS"] == "PAGO")
-    ]["VALOR"].sum()
-    total_paid_lote2 = df[
-        (df["LOTE"] == "LOTE 02") & (df["STATUS"] == "PAGO")
-    ]["VALOR"].sum()
-    pending_payments_lote1 = df[
-        (df["LOTE"] == "LOTE 01") & (df["STATUS"] != "PAGO")
-    ]["VALOR"].sum()
-    pending_payments_lote2 = df[
-        (df["LOTE"] == "LOTE 02") & (df["STATUS"] != "PAGO")
-    ]["VALOR"].sum()
-
-    total_saldo_lote1 = df["SALDO L1"].sum()
-    total_saldo_lote2 = df["SALDO L2"].sum()
-
-    saldo_difference = total_saldo_lote1 - total_saldo_lote2
+        snapshot = carregar_saldos()
+        df = snapshot.tabela
 
-    current_datetime = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    lots, summary = snapshot.derivar(summarize_balances)
 
-    total_mes = pending_payments_lote1 + pending_payments_lote2
-
-    with open("./css/saldos.css") as f:
-        st.markdown(
-            f"<style>{f.read()}</style>",
-            unsafe_allow_html=True,
-        )
+    recursos.aplicar_css("./css/saldos.css")
 
     col1, col2 = st.columns([5, 2])
 
     with col1:
+        contracts = " ||| ".join(
+            f"CONTRATO {contract.id}: R$ {contract.teto:,.2f}" for contract in CONTRATOS
+        )
         st.markdown(
-            '<h3 class="contract">CONTRATO 0100215/2023: R$ 4.500,000 ||| CONTRATO 0200215/2023: R$ 2.900,000</h3>',
+            f'<h3 class="contract">{contracts}</h3>',
             unsafe_allow_html=True
         )
 
@@ -84,133 +64,62 @@ def main():
             "Mês", options=["Todos"] + list(df["MES_ANO"].unique())
         )
 
-    filtered_df = df.copy()
-    if nota_fiscal:
-        filtered_df = filtered_df[
-            filtered_df["NOTA FISCAL"]
-            .astype(str)
-            .str.contains(nota_fiscal)
+    with desempenho.medir("filtrar"):
+        filtered_df = df.copy()
+        if nota_fiscal:
+            filtered_df = filtered_df[
+                filtered_df["NOTA FISCAL"]
+                .astype(str)
+                .str.contains(nota_fiscal)
+            ]
+        if mes != "Todos":
+            filtered_df = filtered_df[
+                filtered_df["MES_ANO"] == mes
+            ]
+
+        monthly_totals_filtered = filtered_df.groupby("DATA MES")["VALOR"].sum()
+
+    with col2, desempenho.medir("gráfico"):
+        graficos.exibir_serie(
+            monthly_totals_filtered,
+            "MES_ANO",
+            "VALOR",
+            minimo="M",
+            cor="#8B0000",
+            titulo="Total de Faturas por Mês",
+            rotulo_x="Mês e Ano",
+        )
+
+    # Uma linha de cartões por contrato e uma com os indicadores gerais
+    cartoes.exibir_cartoes(
+        [
+            card
+            for contract in CONTRATOS
+            for lot in [lots.loc[contract.id]]
+            for card in [
+                (f"Total Pago {contract.rotulo}: ", f'R$ {lot["total_paid"]:,.2f}'),
+                (f"Saldo {contract.rotulo}: ", f'R$ {lot["mean_saldo"]:,.2f}'),
+                (f"Aguardando Pagamento {contract.rotulo}: ", f'R$ {lot["pending_payments"]:,.2f}'),
+                (f"Saldo Total {contract.rotulo}: ", f'R$ {lot["total_saldo"]:,.2f}'),
+            ]
         ]
-    if mes != "Todos":
-        filtered_df = filtered_df[
-            filtered_df["MES_ANO"] == mes
+        + [
+            ("Vl.Médio NFs: ", f'R$ {summary["avg_invoice_value"]:,.2f}'),
+            ("NF: Quantidade: ", summary["total_invoices"]),
         ]
-
-    monthly_totals_filtered = filtered_df.groupby(
-        "MES_ANO"
-    )["VALOR"].sum().reset_index()
-
-    chart = (
-        alt.Chart(monthly_totals_filtered)
-        .mark_bar()
-        .encode(
-            x=alt.X('MES_ANO', title='Mês e Ano', sort=None),
-            y='VALOR',
-            tooltip=["MES_ANO", "VALOR"],
-            color=alt.value("#8B0000"),
-        )
-        .properties(
-            title="Total de Faturas por Mês",
-            width=600,
-            height=400,
-        )
+        + [
+            (
+                f"Diferença entre Saldos {CONTRATOS[0].sigla} e {contract.sigla} : ",
+                f'R${lots.loc[contract.id, "saldo_difference"]:,.2f}',
+            )
+            for contract in CONTRATOS[1:]
+        ]
+        + [
+            ("Total Mes Junho : ", f'R${summary["total_mes"]:,.2f}'),
+        ],
+        "stMetric-container",
     )
 
-    with col2:
-        st.altair_chart(chart, use_container_width=True)
-
-    col3, col4, col5, col6 = st.columns(4)
-    with col3:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Total Pago Lote 1: </span><span class="stMetric-value">R$ '
-            f'{total_paid_lote1:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-    with col4:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Saldo Lote 1: </span><span class="stMetric-value">R$ '
-            f'{summary_stats.loc["mean", "SALDO L1"]:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-    with col5:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Total Pago Lote 2:</span><span class="stMetric-value">R$ '
-            f'{total_paid_lote2:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-    with col6:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Saldo Lote 2: </span><span class="stMetric-value">R$ '
-            f'{summary_stats.loc["mean", "SALDO L2"]:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-
-    col7, col8, col9, col10 = st.columns(4)
-    with col7:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Aguardando Pagamento Lote 1: </span><span class="stMetric-value">R$ '
-            f'{pending_payments_lote1:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-    with col8:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Aguardando Pagamento Lote 2: </span><span class="stMetric-value">R$ '
-            f'{pending_payments_lote2:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-    with col9:
-        avg_invoice_value = df["VALOR"].mean()
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Vl.Médio NFs: </span><span class="stMetric-value">R$ '
-            f'{avg_invoice_value:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-    with col10:
-        total_invoices = df["NOTA FISCAL"].count()
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'NF: Quantidade: </span><span class="stMetric-value">'
-            f'{total_invoices}</span></div>',
-            unsafe_allow_html=True,
-        )
-
-    col11, col12, col13, col14 = st.columns(4)
-    with col11:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Saldo Total Lote 1: </span><span class="stMetric-value">R$ '
-            f'{total_saldo_lote1:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-    with col12:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Saldo Total Lote 2: </span><span class="stMetric-value">R$ '
-            f'{total_saldo_lote2:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-    with col13:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Diferença entre Saldos L1 e L2 : </span><span class="stMetric-value">R$'
-            f'{saldo_difference:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-    with col14:
-        st.markdown(
-            f'<div class="stMetric-container"><span class="stMetric-label">'
-            f'Total Mes Junho : </span><span class="stMetric-value">R$'
-            f'{total_mes:,.2f}</span></div>',
-            unsafe_allow_html=True,
-        )
-
 
 if __name__ == "__main__":
     main()
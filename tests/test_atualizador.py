@@ -0,0 +1,46 @@
+import threading
+from types import SimpleNamespace
+
+from atualizador import Atualizador
+
+
+class Versao(SimpleNamespace):
+    def aquecer(self, anterior):
+        pass
+
+
+def test_primeira_carga_uma_vez_com_a_thread_e_a_requisicao():
+    # Cargas completas: a primeira carga e todo download sem versão anterior
+    cargas = []
+    liberar = threading.Event()
+
+    def carregar(nome):
+        cargas.append(nome)
+        liberar.wait(5)
+        return Versao(versao="v1")
+
+    def baixar(nome, anterior):
+        if anterior is None:
+            return carregar(nome)
+        return anterior
+
+    atualizador = Atualizador(["os"], carregar, baixar, 3600)
+    atualizador.iniciar()
+    requisicao = threading.Thread(target=atualizador.atual, args=("os",))
+    requisicao.start()
+    liberar.set()
+    requisicao.join()
+    atualizador.parar()
+
+    assert cargas == ["os"]
+
+
+def test_mesma_versao_mantem_o_snapshot_atual():
+    primeiro = Versao(versao="v1")
+    atualizador = Atualizador(["os"], lambda nome: primeiro, None, 3600)
+    atualizador.atual("os")
+
+    assert atualizador._trocar("os", Versao(versao="v1")) is primeiro
+    novo = Versao(versao="v2")
+    assert atualizador._trocar("os", novo) is novo
+    assert atualizador.atual("os") is novo
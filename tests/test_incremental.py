@@ -0,0 +1,83 @@
+import io
+
+import pandas as pd
+import pytest
+
+import incremental
+from benchmarks import gerador
+from cubo import atualizar_cubo, montar_cubo
+from dados import Snapshot, tipar_os
+
+
+def carga_completa(bruta):
+    conteudo = bruta.to_csv(index=False).encode()
+    lida = pd.read_csv(io.BytesIO(conteudo))
+    indice = incremental.indexar(conteudo, lida)
+    tabela, rejeitados = tipar_os(lida)
+    return conteudo, Snapshot("v1", None, tabela, rejeitados, indice=indice)
+
+
+def acrescentar(bruta):
+    novas = gerador.gerar_os(40, semente=7)
+    novas["OS"] = [f"9{numero:05d}" for numero in range(len(novas))]
+    return pd.concat([bruta, novas], ignore_index=True)
+
+
+def editar(bruta):
+    bruta = bruta.copy()
+    bruta.loc[10:40, "STATUS*"] = "FINALIZADO"
+    bruta.loc[50:60, "DATA FINALIZADO"] = "01/03/2024"
+    bruta.loc[70:75, "DISCIPLINAS"] = "PINTURA"
+    bruta.loc[80:85, "VALOR ORÇADO"] = "R$ 9.999,99"
+    return bruta
+
+
+def apagar(bruta):
+    return bruta.drop(index=[0, 5, 100, 101, 102, len(bruta) - 1]).reset_index(drop=True)
+
+
+def categoria_nova(bruta):
+    # Valores que a versão anterior não tinha, antes e depois das categorias existentes
+    bruta = bruta.copy()
+    bruta.loc[20:30, "ORÇAMENTISTA"] = "AAA NOVO"
+    bruta.loc[31:35, "DISCIPLINAS"] = "ZINCO"
+    bruta.loc[36:40, "STATUS*"] = "ABC"
+    return bruta
+
+
+def categoria_sumida(bruta):
+    # Os códigos das categorias seguintes mudam e o cubo anterior sai de ordem
+    bruta = bruta.copy()
+    bruta.loc[bruta["ORÇAMENTISTA"] == "BRUNO", "ORÇAMENTISTA"] = "ANA"
+    return bruta
+
+
+def tudo(bruta):
+    return categoria_sumida(categoria_nova(apagar(editar(acrescentar(bruta)))))
+
+
+@pytest.mark.parametrize(
+    "mudar",
+    [acrescentar, editar, apagar, categoria_nova, categoria_sumida, tudo],
+    ids=lambda f: f.__name__,
+)
+def test_carga_incremental_igual_a_completa(mudar):
+    bruta = gerador.gerar_os(3000)
+    _, anterior = carga_completa(bruta)
+    conteudo, completa = carga_completa(mudar(bruta))
+
+    carga = incremental.aplicar(conteudo, anterior, tipar_os, "OS")
+
+    assert carga is not None
+    tabela, _, indice, delta = carga
+    pd.testing.assert_frame_equal(tabela, completa.tabela)
+    pd.testing.assert_index_equal(indice.chaves, completa.indice.chaves)
+
+    cubo = atualizar_cubo(
+        montar_cubo(anterior.tabela), tabela, delta.removidas, delta.adicionadas
+    )
+    esperado = montar_cubo(completa.tabela)
+    for evento, contagens in esperado.eventos.items():
+        pd.testing.assert_frame_equal(cubo.eventos[evento], contagens)
+    pd.testing.assert_frame_equal(cubo.totais, esperado.totais)
+    assert cubo.opcoes == esperado.opcoes
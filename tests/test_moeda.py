@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from moeda import converter_colunas, converter_moeda
+
+CASOS = [
+    ("R$ 1.234,56", 1234.56),
+    ("1234,56", 1234.56),
+    ("1.234", 1234.0),
+    ("R$ 1.234.567,8", 1234567.8),
+    ("-R$ 10,00", -10.0),
+    ("R$ -10,00", -10.0),
+    ("(R$ 10,00)", -10.0),
+    ("R$ -", 0.0),
+    ("-", 0.0),
+]
+VAZIOS = ["", "   ", None]
+MALFORMADOS = ["abc", "R$ 1,2,3", "12.34,5", "R$"]
+
+
+@pytest.mark.parametrize("tipo", [object, "string[python]", "string[pyarrow]"])
+def test_converter_moeda_segue_as_regras(tipo):
+    textos = [texto for texto, _ in CASOS] + VAZIOS + MALFORMADOS
+    numeros, rejeitados = converter_moeda(pd.Series(textos, dtype=tipo))
+
+    esperados = [valor for _, valor in CASOS] + [np.nan] * (len(VAZIOS) + len(MALFORMADOS))
+    np.testing.assert_array_equal(numeros.to_numpy(), esperados)
+    assert rejeitados.tolist() == [False] * (len(CASOS) + len(VAZIOS)) + [True] * len(
+        MALFORMADOS
+    )
+
+
+def test_converter_colunas_com_tipos_de_texto_misturados():
+    tabela = pd.DataFrame(
+        {
+            "VALOR": pd.Series(["R$ 1,50", "", "x"], dtype="string[pyarrow]"),
+            "SALDO": pd.Series(["R$ -", "2.000", None], dtype=object),
+            "TOTAL": [1, 2, 3],
+        }
+    )
+
+    tabela, rejeitados = converter_colunas(tabela, ["VALOR", "SALDO", "TOTAL"])
+
+    np.testing.assert_array_equal(tabela["VALOR"], [1.5, np.nan, np.nan])
+    np.testing.assert_array_equal(tabela["SALDO"], [0.0, 2000.0, np.nan])
+    assert tabela["TOTAL"].dtype == "float64"
+    assert rejeitados[["coluna", "linha", "valor"]].values.tolist() == [["VALOR", 2, "x"]]
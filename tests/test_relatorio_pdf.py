@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from benchmarks import gerador
+from dados import tipar_os
+from relatorio_pdf import gerar_pdf, latin1
+
+
+def test_latin1_substitui_o_que_nao_cabe():
+    assert latin1("CIVIL – LOTE “01” ✓") == 'CIVIL - LOTE "01" ?'
+    assert latin1("ELÉTRICA") == "ELÉTRICA"
+
+
+def test_pdf_com_disciplinas_fora_do_latin1():
+    hoje = datetime.now().date()
+    bruta = gerador.gerar_os(2000, hoje=hoje)
+    bruta["DISCIPLINAS"] = bruta["DISCIPLINAS"] + " – LOTE ✓"
+    tabela, _ = tipar_os(bruta)
+
+    pdf = gerar_pdf(tabela, hoje)
+
+    assert pdf.startswith(b"%PDF")
@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+# Grão -> regra de reamostragem do pandas
+REGRAS = {"D": "D", "W": "W", "M": "ME"}
+
+
+@dataclass(frozen=True)
+class Vazao:
+    # OS finalizadas por dia do calendário, do primeiro ao último dia com
+    # finalização; dias sem OS finalizada entram com zero
+    dias: pd.Series
+    # As mesmas contagens somadas por semana (terminada no domingo) e por mês
+    semanas: pd.Series
+    meses: pd.Series
+
+
+def montar_vazao(tabela):
+    finalizadas = tabela["DATA FINALIZADO"].dropna()
+    contagem = finalizadas.value_counts(sort=False).sort_index()
+    contagem.index = pd.DatetimeIndex(contagem.index, name="DATA FINALIZADO")
+    dias = contagem.resample(REGRAS["D"]).sum().rename("QUANTIDADE")
+    return Vazao(
+        dias=dias,
+        semanas=dias.resample(REGRAS["W"]).sum(),
+        meses=dias.resample(REGRAS["M"]).sum(),
+    )
+
+
+def recortar(vazao, inicio=None, fim=None, grao="D"):
+    serie = {"D": vazao.dias, "W": vazao.semanas, "M": vazao.meses}[grao]
+    return serie.loc[
+        None if inicio is None else pd.Timestamp(inicio):
+        None if fim is None else pd.Timestamp(fim)
+    ]
+
+
+def media_diaria(vazao, inicio=None, fim=None):
+    # OS finalizadas por dia corrido no período, contando os dias sem finalização.
+    # O período fica limitado aos dias cobertos pela planilha, para que um ano
+    # ainda em andamento não seja dividido pelos dias que não chegaram
+    dias = recortar(vazao, inicio, fim)
+    return float(dias.mean()) if len(dias) else 0.0
+
+
+def preencher(por_dia, dias):
+    # Contagens por dia de um recorte filtrado, levadas aos dias corridos de `dias`
+    return por_dia.reindex(dias.index, fill_value=0).rename(dias.name)